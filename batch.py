@@ -0,0 +1,205 @@
+#!venv/bin/python
+# coding=UTF-8
+# -*- coding: UTF-8 -*-
+# vim: set fileencoding=UTF-8 :
+
+"""
+Renders many story .tsv files at once, one worker process per core
+
+Files can be given as paths, globs (quote them so that ** reaches Python),
+or listed one per line in a manifest.  A failed story is recorded in the
+summary table and the rest keep going.
+"""
+
+import contextlib
+import csv
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import *
+
+import click
+
+from storyboard import Profiler, RenderCache, Storyboard
+
+SUMMARY_COLUMNS: List[str] = [
+    "FILE",
+    "STATUS",
+    "SECONDS",
+    "PARSE",
+    "FINALIZE",
+    "GRAPH",
+    "RENDER",
+    "MESSAGE",
+]
+
+
+def expand(patterns: Iterable[str], manifest: Optional[TextIO]) -> List[str]:
+    """Story files in the order given, without duplicates"""
+    if manifest:
+        patterns = list(patterns) + [
+            line.strip()
+            for line in manifest
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+    files: Dict[str, None] = {}
+    for p in patterns:
+        for f in sorted(glob.glob(p, recursive=True)) or [p]:
+            files[f] = None
+    return list(files)
+
+
+def render_story(
+    file: str,
+    formats: List[str],
+    story_args: Dict[str, Any],
+    cache: Optional[Tuple[str, int]] = None,
+    emit: str = "render",
+) -> Dict:
+    """
+    Runs in a worker process; never raises so one bad story can't stop the batch
+    :param emit: how far to go: "render", "dot" (.gv files only), or "stats"
+    """
+    profiler = Profiler()
+    if cache:
+        story_args = dict(story_args, render_cache=RenderCache(*cache))
+    row: Dict[str, Any] = {"FILE": file, "STATUS": "ok", "MESSAGE": ""}
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            s = Storyboard(file=file, profiler=profiler, load_final=False, **story_args)
+            if emit == "stats":
+                s.finalize()
+            else:
+                s.output(True, formats, render=emit == "render")
+    except Exception as e:  # noqa: anything a single story does is reported
+        row["STATUS"] = "failed"
+        row["MESSAGE"] = f"{type(e).__name__}: {e}".replace("\n", " | ")
+    row["SECONDS"] = f"{time.perf_counter() - start:.3f}"
+    for phase in ("parse", "finalize", "graph", "render"):
+        t = sum(p["wall_s"] for p in profiler.phases if p["phase"] == phase)
+        row[phase.upper()] = f"{t:.3f}"
+    return row
+
+
+@click.command()
+@click.argument("stories", nargs=-1)
+@click.option(
+    "-m",
+    "--manifest",
+    type=click.File("r"),
+    help="File with one story path (or glob) per line; '#' starts a comment",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Worker processes",
+)
+@click.option(
+    "-s",
+    "--summary",
+    type=click.File("w"),
+    default="-",
+    help="Where to write the .tsv summary table (default stdout)",
+)
+@click.option(
+    "-d",
+    "--dir",
+    "rankdir",
+    type=click.Choice(["TB", "LR", "BT", "RL"], case_sensitive=False),
+    default="LR",
+    help="Rendering direction, as in storyboard.py",
+)
+@click.option(
+    "-o",
+    "--format",
+    "output_list",
+    type=click.STRING,
+    multiple=True,
+    default=["svg", "pdf"],
+    help="Output format, as in storyboard.py",
+)
+@click.option("-c", "--color-names", type=click.BOOL, is_flag=True)
+@click.option(
+    "-t",
+    "--time-style",
+    type=click.Choice(["LINE", "BOX", "AUTO"], case_sensitive=False),
+    default="BOX",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    envvar="PLOTDMG_CACHE_DIR",
+    help="Render cache shared by every worker, as in storyboard.py",
+)
+@click.option("--cache-size", type=click.IntRange(min=1), default=512)
+@click.option(
+    "--emit",
+    type=click.Choice(["render", "dot"], case_sensitive=False),
+    default="render",
+    show_default=True,
+    help="Stop after writing the .gv files (dot) instead of rendering them",
+)
+@click.option(
+    "--stats-only",
+    type=click.BOOL,
+    is_flag=True,
+    help="Only load and check each story, without drawing any graphs",
+)
+def main(
+    stories: List[str],
+    manifest: Optional[TextIO],
+    jobs: int,
+    summary: TextIO,
+    rankdir: str,
+    output_list: List[str],
+    color_names: bool,
+    time_style: str,
+    cache_dir: Optional[str],
+    cache_size: int,
+    emit: str,
+    stats_only: bool,
+):
+    files = expand(stories, manifest)
+    if not files:
+        raise click.UsageError("No story files given")
+    story_args = {
+        "g_attr": {"rankdir": rankdir.upper().strip()},
+        "color_names": color_names,
+        "time_style": time_style,
+    }
+    cache = (cache_dir, cache_size << 20) if cache_dir else None
+    out = csv.DictWriter(summary, SUMMARY_COLUMNS, delimiter="\t", lineterminator="\n")
+    out.writeheader()
+    failed: int = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = [
+            pool.submit(
+                render_story,
+                f,
+                list(output_list),
+                story_args,
+                cache,
+                "stats" if stats_only else emit.lower(),
+            )
+            for f in files
+        ]
+        for done in as_completed(pending):
+            row = done.result()
+            failed += row["STATUS"] != "ok"
+            out.writerow(row)
+            summary.flush()
+    done: str = "checked" if stats_only else "rendered" if emit == "render" else "drawn"
+    click.echo(f"{len(files) - failed} of {len(files)} stories {done}", err=True)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!venv/bin/python
+# coding=UTF-8
+# -*- coding: UTF-8 -*-
+# vim: set fileencoding=UTF-8 :
+
+"""
+Times each phase of building a storyboard at several story sizes
+
+Stories come from storygen.py; a scale of N multiplies the characters,
+events, combiners, universal events, and loopers of the base story by N.
+Output is a .tsv table: one row per scale and phase with the wall time, the
+peak memory allocated by Python during that phase, and how much of it the
+story still holds when the phase is over.
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import *
+
+import click
+
+from storyboard import Storyboard
+from storygen import generate_story
+
+
+def phases(path: str, formats: List[str]) -> List[Tuple[str, Callable[[], Any]]]:
+    """The steps of storyboard.main, each run after the one before it"""
+    s: List[Storyboard] = []
+    out = [
+        (
+            "load_file",
+            lambda: s.append(Storyboard(file=path, g_attr={}, load_final=False)),
+        ),
+        ("finalize", lambda: s[0].finalize()),
+        ("make_graph", lambda: s[0].make_graph()),
+        ("dot_source", lambda: len(s[0].graph.source) + len(s[0].friendships.source)),
+    ]
+    if formats:
+        out.append(
+            (
+                "render",
+                lambda: s[0].render_all([s[0].graph, s[0].friendships], formats, True),
+            )
+        )
+    return out
+
+
+def time_phases(path: str, formats: List[str]) -> Dict[str, float]:
+    seconds: Dict[str, float] = {}
+    for name, fn in phases(path, formats):
+        start = time.perf_counter()
+        fn()
+        seconds[name] = time.perf_counter() - start
+    return seconds
+
+
+def traced_memory(path: str, formats: List[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Run separately from time_phases because tracing slows everything down
+    :return: phase -> (bytes still allocated after it, peak bytes during it)
+    """
+    traced: Dict[str, Tuple[int, int]] = {}
+    for name, fn in phases(path, formats):
+        tracemalloc.start()
+        fn()
+        traced[name] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return traced
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--scale",
+    "scales",
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[1, 4, 16],
+    show_default=True,
+    help="Repeat to benchmark several story sizes",
+)
+@click.option("--timelines", type=click.IntRange(min=1), default=2, show_default=True)
+@click.option("--places", type=click.IntRange(min=1), default=4, show_default=True)
+@click.option(
+    "-o",
+    "--format",
+    "formats",
+    type=click.STRING,
+    multiple=True,
+    help="Also time rendering to these formats (needs Graphviz installed)",
+)
+@click.option(
+    "--memory/--no-memory",
+    default=True,
+    show_default=True,
+    help="Measure memory with a second, traced run of every phase",
+)
+@click.option("--seed", type=click.INT, default=0, show_default=True)
+def main(
+    scales: List[int],
+    timelines: int,
+    places: int,
+    formats: List[str],
+    memory: bool,
+    seed: int,
+):
+    click.echo("SCALE\tROWS\tPHASE\tSECONDS\tPEAK_MIB\tKEPT_MIB")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in scales:
+            path = os.path.join(tmp, f"bench-{n}.tsv")
+            generate_story(
+                path,
+                timelines=timelines,
+                places=places,
+                events=20 * n,
+                characters=50 * n,
+                combiners=5 * n,
+                universal=3 * n,
+                loopers=5 * n,
+                seed=seed,
+            )
+            with open(path) as f:
+                rows = sum(1 for _ in f) - 1
+            seconds = time_phases(path, list(formats))
+            traced = traced_memory(path, list(formats)) if memory else {}
+            for phase, t in seconds.items():
+                kept, peak = (
+                    (f"{b / 2 ** 20:.1f}" for b in traced[phase])
+                    if phase in traced
+                    else ("", "")
+                )
+                click.echo(f"{n}\t{rows}\t{phase}\t{t:.3f}\t{peak}\t{kept}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+// shows the text of the nearest element whose id is in tooltips, see
+// Storyboard.tooltip_attrs
+function showTooltips(graph, tooltips) {
+  const tip = document.body.appendChild(document.createElement("div"));
+  tip.style.cssText = "position: fixed; display: none; white-space: pre;"
+    + " pointer-events: none; background: #ffffee; border: 1px solid #888;"
+    + " padding: 4px; font: 12px sans-serif";
+  graph.addEventListener("mousemove", e => {
+    let el = e.target;
+    while (el !== graph && !Object.hasOwn(tooltips, el.id)) el = el.parentNode;
+    tip.style.display = el === graph ? "none" : "block";
+    if (el === graph) return;
+    tip.textContent = tooltips[el.id];
+    tip.style.left = e.clientX + 12 + "px";
+    tip.style.top = e.clientY + 12 + "px";
+  });
+  graph.addEventListener("mouseleave", () => tip.style.display = "none");
+}
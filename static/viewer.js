@@ -0,0 +1,143 @@
+// lays the tiles of Storyboard.write_viewer out in rows (one per Timeline)
+// and only keeps the SVGs of the ones near the visible area loaded
+function showTiles(lines, tooltipsUrl) {
+  const view = document.getElementById("view");
+  const board = document.getElementById("board");
+  const toc = document.getElementById("toc");
+  const bySvg = {};  // file name -> tile div, to follow links between tiles
+  const near = new Set();
+  const minZoom = 0.2;  // below this, tiles are left as placeholders
+  let zoom = 1;
+
+  function load(div) {
+    if (div.loading) return div.loading;
+    const p = fetch(div.dataset.svg).then(r => r.text()).then(svg => {
+      if (div.loading !== p) return;  // unloaded before it arrived
+      div.innerHTML = svg;
+      div.style.width = div.style.height = "";
+      div.classList.add("loaded");
+    });
+    return div.loading = p;
+  }
+
+  function unload(div) {
+    div.loading = null;
+    const svg = div.querySelector("svg");
+    if (!svg) return;
+    div.style.width = svg.getAttribute("width");  // keep its place
+    div.style.height = svg.getAttribute("height");
+    div.classList.remove("loaded");
+    div.textContent = div.dataset.label;
+  }
+
+  const observer = new IntersectionObserver(entries => entries.forEach(e => {
+    if (e.isIntersecting) {
+      near.add(e.target);
+      if (zoom >= minZoom) load(e.target);
+    } else {
+      near.delete(e.target);
+      unload(e.target);
+    }
+  }), {root: view, rootMargin: "50%"});
+
+  function go(div, title) {
+    history.replaceState(null, "", "#" + div.id
+      + (title ? "/" + encodeURIComponent(title) : ""));
+    div.scrollIntoView({block: "center", inline: "center"});
+    load(div).then(() => {
+      const t = title && [...div.querySelectorAll("g > title")]
+        .find(t => t.textContent === title);
+      if (!t) return;
+      t.parentNode.scrollIntoView({block: "center", inline: "center"});
+      t.parentNode.animate([{opacity: 0.2}, {opacity: 1}],
+        {duration: 500, iterations: 3});
+    });
+  }
+
+  function link(parent, text, onclick) {
+    const a = parent.appendChild(document.createElement("a"));
+    a.textContent = text;
+    a.href = "javascript:void(0)";
+    a.onclick = onclick;
+    return a;
+  }
+
+  // one row of tiles per Timeline; the contents follow its clusters
+  for (const line of lines) {
+    const row = board.appendChild(document.createElement("div"));
+    row.className = "line";
+    const lineToc = toc.appendChild(document.createElement("details"));
+    lineToc.open = lines.length === 1;
+    lineToc.appendChild(document.createElement("summary")).textContent = line.name;
+    for (const tile of line.tiles) {
+      const div = row.appendChild(document.createElement("div"));
+      div.className = "tile";
+      div.id = "tile-" + Object.keys(bySvg).length;
+      div.dataset.svg = tile.svg;
+      div.textContent = div.dataset.label = tile.label;
+      bySvg[tile.svg] = div;
+      observer.observe(div);
+      const tileToc = lineToc.appendChild(document.createElement("details"));
+      link(tileToc.appendChild(document.createElement("summary")), tile.label,
+        () => go(div));
+      const boxes = tileToc.appendChild(document.createElement("ul"));
+      tileToc.addEventListener("toggle", () => {  // time boxes, when asked for
+        if (boxes.childElementCount) return;
+        for (const [label, title, events] of tile.boxes) {
+          const li = boxes.appendChild(document.createElement("li"));
+          link(li, label, () => go(div, title));
+          for (const e of events) {
+            li.append(" ");
+            link(li, e, () => go(div, e)).className = "event";
+          }
+        }
+      });
+    }
+  }
+
+  // a stub links to the tile its line goes on to; find its event there
+  board.addEventListener("click", e => {
+    const a = e.target.closest("a");
+    const div = a && bySvg[a.getAttribute("xlink:href") || a.getAttribute("href")];
+    if (!div) return;
+    e.preventDefault();
+    const stub = a.closest("g.node")?.querySelector("title")?.textContent;
+    go(div, stub && stub.slice(0, stub.lastIndexOf("~")));
+  });
+
+  let drag = null;
+  view.addEventListener("mousedown", e => {
+    if (e.target.closest("a")) return;
+    drag = [e.clientX, e.clientY];
+    view.style.cursor = "grabbing";
+    e.preventDefault();
+  });
+  addEventListener("mousemove", e => {
+    if (!drag) return;
+    view.scrollBy(drag[0] - e.clientX, drag[1] - e.clientY);
+    drag = [e.clientX, e.clientY];
+  });
+  addEventListener("mouseup", () => {
+    drag = null;
+    view.style.cursor = "";
+  });
+  view.addEventListener("wheel", e => {  // zoom around the mouse pointer
+    if (!e.ctrlKey) return;
+    e.preventDefault();
+    const old = zoom;
+    zoom = Math.min(4, Math.max(0.02, zoom * (e.deltaY < 0 ? 1.1 : 1 / 1.1)));
+    const r = view.getBoundingClientRect();
+    const x = e.clientX - r.left, y = e.clientY - r.top;
+    board.style.zoom = zoom;
+    view.scrollLeft = (view.scrollLeft + x) * zoom / old - x;
+    view.scrollTop = (view.scrollTop + y) * zoom / old - y;
+    if (zoom >= minZoom) near.forEach(load);
+  }, {passive: false});
+
+  if (tooltipsUrl) {
+    fetch(tooltipsUrl).then(r => r.json()).then(t => showTooltips(board, t));
+  }
+  const [tile, title] = location.hash.slice(1).split("/");
+  const start = tile && document.getElementById(tile);
+  if (start) go(start, title && decodeURIComponent(title));
+}
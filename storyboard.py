@@ -8,7 +8,8 @@ Package to generate plot diagrams from TSV files
 
 ---------
 
-Output can be cleaned up with 'rm *.gv*'
+Output can be cleaned up with 'rm *.gv*', plus 'rm *.html *.tooltips.json' for
+--partition, --tile, or --tooltips sidecar and 'rm *.tsv.snap' for --snapshot
 
 ---------
 
@@ -85,22 +86,146 @@ A comment line that will be skipped without errors or warnings
 :args whatever you want:
 
 """
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
 
 import click
+import copyreg
+import cProfile
 import csv
+import gc
+import hashlib
+import hmac
+import html
+import json
+import os
+import pickle
+import re
+import shutil
+import subprocess
+import threading
+import sys
+import time
 from typing import *
 import abc
 import graphviz as gv
-from collections import Counter, defaultdict
+from collections import ChainMap, Counter, defaultdict, deque
 from defaultlist import defaultlist
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial, wraps
+from pathlib import Path
+from string import Template
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+try:
+    from graphviz.quoting import quote, quote_edge
+except ImportError:  # graphviz < 0.18
+    from graphviz.lang import quote, quote_edge
+
+
+def frozen_property(fn: Callable) -> property:
+    """
+    A property that is computed only once after its story is final
+    Storyboard.clear_cache forgets every stored value
+    """
+    key: str = fn.__qualname__  # overrides calling super() get their own slot
+
+    @wraps(fn)
+    def getter(self):
+        story: "Storyboard" = self.story
+        if not story.is_final:
+            return fn(self)
+        k = (id(self), key)
+        try:
+            return story.derived_cache[k]
+        except KeyError:
+            story.derived_cache[k] = v = fn(self)
+            return v
+
+    return property(getter)
+
+
+def profiled(name: str) -> Callable:
+    """Records a Storyboard method as a phase when the story has a Profiler"""
+
+    def wrap(fn: Callable) -> Callable:
+        @wraps(fn)
+        def method(self: "Storyboard", *args, **kwargs):
+            with self.phase(name):
+                return fn(self, *args, **kwargs)
+
+        return method
+
+    return wrap
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls: type) -> Tuple[str, ...]:
+    return tuple(
+        s
+        for c in reversed(cls.__mro__)
+        for s in c.__dict__.get("__slots__", ())
+        if s not in ("__dict__", "__weakref__")
+    )
+
+
+def restore_element(
+    cls: type, serial: int, chars: "Optional[FrozenSet[Character]]" = None
+) -> "StoryElement":
+    """
+    Unpickles a StoryElement with what its __hash__ needs already in place
+    (snapshots are full of sets and dicts keyed by elements still being loaded)
+    """
+    e = cls.__new__(cls)
+    e.serial = serial
+    if chars is not None:
+        e.chars = chars
+        set.update(e, chars)
+    return e
+
+
+class SnapshotPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        """Counters load as plain dicts would, skipping the slow Counter.__init__"""
+        if type(obj) is Counter:
+            return copyreg.__newobj__, (Counter,), None, None, iter(obj.items())
+        return NotImplemented
+
+
+@contextmanager
+def bulk_pickling(limit: int = 100_000):
+    """
+    Long chains of events and characters are pickled recursively, and
+    the millions of objects in a snapshot would keep the cyclic GC busy
+    """
+    old: int = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old, limit))
+    was_enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+        sys.setrecursionlimit(old)
 
 
 class StoryElement(abc.ABC):
+    # Abstract bases stay empty so that Combiner can also be a set;
+    # the concrete classes made by the thousand list their own slots
+    __slots__ = ()
+    element_slots: Tuple[str, ...] = ("story", "serial", "key", "short_name", "color")
+
     def __init__(self, name: str, s: "Storyboard", /, **kwargs):
         assert s, f"No story connected with this element"
         assert name, f"Empty name"
         self.story = s
+        s.element_count += 1
+        self.serial: int = s.element_count  # stable hash -> stable DOT output
         self.name = name.strip()
         self.key: str = kwargs["key"] if kwargs.get("key") else self.name.lower()
         self.short_name: str = kwargs["short_name"] if kwargs.get(
@@ -117,28 +242,23 @@ class StoryElement(abc.ABC):
     def lst2str(a: "Iterable[StoryElement]") -> str:
         return ", ".join(c.name for c in a)
 
-    def possible_groups(self, c: "Iterable[Character]") -> "List[Combiner]":
-        chars2match = set(c)  # capture iterator output for looping
-        return sorted(
-            [combo for combo in self.story.grouped_roster if combo <= chars2match],
-            key=Combiner.size_key,
-        )
+    @staticmethod
+    def in_file_order(a: "Iterable[StoryElementType]") -> "List[StoryElementType]":
+        """Set order can change when a snapshot is loaded; file order can't"""
+        return sorted(a, key=lambda e: e.serial)
 
     def longest_matching_combiner(
         self, c: "Iterable[Character]"
     ) -> "Optional[Combiner]":
-        try:
-            return self.possible_groups(c)[-1]
-        except IndexError:
-            return None
+        return self.story.combiner_for_mask(Combiner.mask_of(set(c)))
 
-    @property
+    @frozen_property
     def tooltip_txt(self) -> str:
         if not self.roster:
             return ""
         return f"{self.name}" + ("\n📒Roster: " + self.lst2str(self.roster))
 
-    @property
+    @frozen_property
     def tooltip_js(self) -> str:
         return self.jsa(self.tooltip_txt)
 
@@ -154,8 +274,22 @@ class StoryElement(abc.ABC):
     def __str__(self):
         return self.name
 
+    def __hash__(self):
+        return self.serial
+
+    def __getstate__(self) -> Any:
+        state = getattr(self, "__dict__", None)
+        if not type(self).__slots__:
+            return state
+        return state, {s: getattr(self, s) for s in slot_names(type(self))}
+
+    def __reduce_ex__(self, protocol):
+        return restore_element, (type(self), self.serial), self.__getstate__()
+
 
 class HasTimeOffset(abc.ABC):
+    __slots__ = ()
+
     def __init__(self, offset: int = 0, **_kwargs):
         self.local_offset = offset
 
@@ -185,6 +319,8 @@ class HasTimeOffset(abc.ABC):
 
 
 class EventConnector(StoryElement, abc.ABC):
+    __slots__ = ()
+
     def __init__(self, name: str, s: "Storyboard", **kwargs):
         super().__init__(name, s, **kwargs)
         self.bridges: "List[EventBridge]" = []
@@ -199,6 +335,8 @@ class EventConnector(StoryElement, abc.ABC):
 
 
 class EventSequence(EventConnector, abc.ABC):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -215,7 +353,7 @@ class EventSequence(EventConnector, abc.ABC):
         if es:
             self.add_event_list(es, dashed_links)
 
-    @property
+    @frozen_property
     def events(self) -> "List[EventType]":
         return [e[0] for e in self.e_lst]
 
@@ -242,7 +380,7 @@ class EventSequence(EventConnector, abc.ABC):
         if add_now:  # you need to do this manually in the overriding method if False
             self.add_links_to_story()
 
-    @property
+    @frozen_property
     def has_loop(self) -> bool:
         """Does this sequence contain the same event twice?"""
         return False if len(self.events) == len(set(self.events)) else True
@@ -267,6 +405,7 @@ class EventSequence(EventConnector, abc.ABC):
 
     def add_event(self, e: "EventType", dash_b4: bool = False, dash_next: bool = False):
         self.e_lst.append(EventInSequence(e, dash_b4, dash_next))
+        self.story.clear_cache()
 
     @property
     def dash_list(self) -> List[bool]:
@@ -275,7 +414,7 @@ class EventSequence(EventConnector, abc.ABC):
             for i in range(1, len(self.e_lst))
         ]
 
-    @property
+    @frozen_property
     def roster(self) -> "Set[Character]":
         out: "Set[Character]" = set()
         for event in self.events:
@@ -311,17 +450,63 @@ class TimedEventSequence(EventSequence, HasTimeOffset, abc.ABC):
         if self.short_name.lower().strip() != self.key:
             story.line_list[self.short_name.lower()] = self
         self.ts: "Dict[int, EventType]" = {}
+        self.sorted_ts: List[int] = []  # same order as e_lst
 
     @property
     def timestamps(self) -> "List[int]":
         """
         :return: a sorted list of timestamps for the events of a timeline
         """
-        return sorted({e.counter for e in self.events})
+        return self.sorted_ts
 
     def sort_events(self) -> None:
-        """Sorts the event sequence into chronological order"""
+        """
+        Sorts the event sequence into chronological order
+        add_event already keeps it sorted, so this is only needed after
+        rearranging e_lst by hand
+        """
         self.e_lst.sort(key=TimedEventSequence.time_key)
+        self.sorted_ts = [x.counter for x in self.e_lst]
+
+    def events_between(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> "List[EventType]":
+        """:return: events from start to end (inclusive) in chronological order"""
+        lo = 0 if start is None else bisect_left(self.sorted_ts, start)
+        hi = len(self.sorted_ts) if end is None else bisect_right(self.sorted_ts, end)
+        return [x.event for x in self.e_lst[lo:hi]]
+
+    def bridge_position(self, e: "EventType") -> Optional[int]:
+        """
+        :return: the index in bridges of the one that leaves e (len(bridges)
+            if e is the last one reached), or None if no bridge touches e
+        """
+        lo, hi = 0, len(self.bridges)
+        while lo < hi:  # bridges are in time order, see build_bridges
+            mid = (lo + hi) // 2
+            if self.bridges[mid].past.counter < e.counter:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.bridges) and self.bridges[lo].past is e:
+            return lo
+        if lo and lo == len(self.bridges) and self.bridges[-1].future is e:
+            return lo
+        return None
+
+    def event_at_or_before(self, t: int) -> "Optional[EventType]":
+        i = bisect_right(self.sorted_ts, t)
+        return self.e_lst[i - 1].event if i else None
+
+    def previous_event(self, t: int) -> "Optional[EventType]":
+        """:return: the last event strictly before t"""
+        i = bisect_left(self.sorted_ts, t)
+        return self.e_lst[i - 1].event if i else None
+
+    def next_event(self, t: int) -> "Optional[EventType]":
+        """:return: the first event strictly after t"""
+        i = bisect_right(self.sorted_ts, t)
+        return self.e_lst[i].event if i < len(self.e_lst) else None
 
     @staticmethod
     def time_key(x: "EventInSequence") -> int:
@@ -339,6 +524,23 @@ class TimedEventSequence(EventSequence, HasTimeOffset, abc.ABC):
         self.story.event_list[n.replace("_", "-")] = e
         super().add_event(e, dash_b4, dash_next)
         self.ts[e.counter] = e
+        i = bisect_left(self.sorted_ts, e.counter)
+        self.sorted_ts.insert(i, e.counter)
+        if i < len(self.e_lst) - 1:  # keep e_lst in order instead of sorting later
+            self.e_lst.insert(i, self.e_lst.pop())
+
+    def remove_event(self, e: "EventType") -> None:
+        """Undoes add_event for an event whose row failed to load"""
+        n: str = e.name.lower().strip()
+        for k in (n, n.replace("_", "-")):
+            if self.story.event_list.get(k) is e:
+                del self.story.event_list[k]
+        if self.ts.get(e.counter) is e:
+            del self.ts[e.counter]
+            i = bisect_left(self.sorted_ts, e.counter)
+            del self.sorted_ts[i]
+            del self.e_lst[i]
+        self.story.clear_cache()
 
 
 class Timeline(TimedEventSequence):
@@ -355,43 +557,83 @@ class Timeline(TimedEventSequence):
         if self.color is None:
             self.color = story.color
         story.timelines.add(self)
+        story.clear_cache()
 
     def __repr__(self):
         return f"Timeline {self.name}"
 
     def add_cap(self) -> None:
+        lazy: bool = self.story.lazy_universal
+        used: List[Place] = [p for p in self.in_file_order(self.places) if p.e_lst]
         if not self.timestamps:
-            EventAnchor(f"empty-{self.name}-start", self, -1, opener=True)
-            EventAnchor(f"empty-{self.name}-finish", self, 1, closer=True)
+            caps = [
+                EventAnchor(
+                    f"empty-{self.name}-start", self, -1, opener=True, lazy=lazy
+                ),
+                EventAnchor(
+                    f"empty-{self.name}-finish", self, 1, closer=True, lazy=lazy
+                ),
+            ]
         else:
-            EventAnchor(f"{self.name} start", self, self.timestamps[0] - 1, opener=True)
-            EventAnchor(
-                f"{self.name} finish", self, self.timestamps[-1] + 1, closer=True
-            )
+            caps = [
+                EventAnchor(
+                    f"{self.name} start",
+                    self,
+                    self.timestamps[0] - 1,
+                    opener=True,
+                    lazy=lazy,
+                ),
+                EventAnchor(
+                    f"{self.name} finish",
+                    self,
+                    self.timestamps[-1] + 1,
+                    closer=True,
+                    lazy=lazy,
+                ),
+            ]
+        if lazy:  # cap only the places that have events
+            for cap in caps:
+                for p in used:
+                    cap.add_child(p)
 
     def make_graph(
         self,
+        parent: "GraphType",
         direction: str = "LR",
         *,
         only_one: bool = False,
         color_names: bool = False,
-    ) -> gv.Digraph:
-        g = gv.Digraph(("" if only_one else "cluster-") + self.name)
-        g.attr(compound="True", color=self.color)
-        if not only_one:
-            if color_names:
-                g.attr(fontcolor=self.color)
-            g.attr(
-                label=self.name,
-                penwidth="2",
-                fontname="sans bold",
-                fontsize="28",
-                tooltip=self.tooltip_txt,
-                URL=self.tooltip_js,
-            )
-        for ts in [e.make_cluster(direction) for e in self.events]:
-            g.subgraph(ts)
-        return g
+        only: "Optional[Set[EventType]]" = None,
+    ) -> None:
+        """
+        Draws this timeline as a subgraph of parent
+        :param only: the events to draw, if not all of them
+        """
+        with parent.subgraph(name=("" if only_one else "cluster-") + self.name) as g:
+            g.attr(compound="True", color=self.color)
+            if not only_one:
+                if color_names:
+                    g.attr(fontcolor=self.color)
+                g.attr(
+                    label=self.name,
+                    penwidth="2",
+                    fontname="sans bold",
+                    fontsize="28",
+                    **self.story.tooltip_attrs(
+                        f"t:{self.name}",
+                        self.tooltip_txt,
+                        tooltip=self.tooltip_txt,
+                        URL=self.tooltip_js,
+                    ),
+                )
+            boxes = self.events
+            if only is not None:  # cheaper than checking all of self.events
+                boxes = sorted(
+                    (e for e in only if self.ts.get(e.counter) is e),
+                    key=lambda e: e.counter,
+                )
+            for e in boxes:
+                e.make_cluster(g, direction, only)
 
     def build_bridges(
         self, show_name: bool = True, show_number: bool = True, **da
@@ -430,6 +672,7 @@ class Place(TimedEventSequence):
         self.timeline = tl
         story.places.add(self)
         tl.places.add(self)
+        story.clear_cache()
 
     def __repr__(self):
         return f"Place {self.name}"
@@ -441,12 +684,26 @@ class Place(TimedEventSequence):
             da["arrowhead"] = "onormal"
         super().build_bridges(show_name, show_number, da, dash_style="dotted")
 
-    @property
+    @frozen_property
     def tooltip_txt(self) -> str:
         return super().tooltip_txt.replace("\n📒Roster: ", "\nVisitors: ")
 
 
 class EventBase(StoryElement, HasTimeOffset, abc.ABC):
+    __slots__ = StoryElement.element_slots + (
+        "name",
+        "line",
+        "local_counter",
+        "local_offset",
+        "attendees",
+        "entrances",
+        "exits",
+        "opener",
+        "closer",
+        "universal_event",
+        "skip_in_friendship_graph",
+        "no_box",
+    )
     can_attend: bool
     grad_dir: Dict[str, str] = {
         "LR": "0",
@@ -496,7 +753,7 @@ class EventBase(StoryElement, HasTimeOffset, abc.ABC):
         if vegan:
             print(name)
 
-    @property
+    @frozen_property
     def loopers(self) -> "Set[Character]":
         return {k for (k, v) in self.attendees.items() if v > 1}
 
@@ -519,7 +776,7 @@ class EventBase(StoryElement, HasTimeOffset, abc.ABC):
     def total_offset(self, o: int):
         self.local_offset = o - self.line.local_offset
 
-    @property
+    @frozen_property
     def tooltip_txt(self) -> str:
         o: str = super().tooltip_txt
         if o and self.skip_in_friendship_graph:
@@ -527,9 +784,9 @@ class EventBase(StoryElement, HasTimeOffset, abc.ABC):
         if not self.universal_event:
             o = o.replace(self.name, f"{self.name} [{self.line.name}]")
         if self.entrances:
-            o += "\n🛬Entrances: " + Character.lst2str(self.entrances)
+            o += "\n🛬Entrances: " + self.lst2str(self.in_file_order(self.entrances))
         if self.exits:
-            o += "\n🛫Departures: " + Character.lst2str(self.exits)
+            o += "\n🛫Departures: " + self.lst2str(self.in_file_order(self.exits))
         if self.loopers:
             o += "\n➰Loopers: " + Character.lst2str(self.loopers)
         if o and self.skip_in_friendship_graph:
@@ -538,17 +795,20 @@ class EventBase(StoryElement, HasTimeOffset, abc.ABC):
             o += "\n\n👥Groups: " + Combiner.lst2str(self.group_attendance)
         return o
 
-    @property
+    @frozen_property
     def group_attendance(self) -> "List[Combiner]":
-        y: "List[Character]" = list(self.attendees.elements())
+        y: "Counter[Character]" = Counter(self.attendees)
+        mask: int = Combiner.mask_of(y)
         o: "List[Combiner]" = []
-        while y:  # convert Character lines into Combiner lines
-            o.append(self.longest_matching_combiner(y))
+        while mask:  # convert Character lines into Combiner lines
+            o.append(self.story.combiner_for_mask(mask))
             for c in o[-1].chars:
-                y.remove(c)
+                y[c] -= 1
+                if not y[c]:
+                    mask &= ~c.mask
         return [g for g in o if len(g.chars) > 1]
 
-    @property
+    @frozen_property
     def roster(self) -> "Set[Character]":
         return set(self.attendees)
 
@@ -556,12 +816,17 @@ class EventBase(StoryElement, HasTimeOffset, abc.ABC):
     def node_label(self) -> str:
         return self.name.replace("_", "\n")
 
+    @property
+    def timeline(self) -> "Timeline":
+        return self.line if isinstance(self.line, Timeline) else self.line.timeline
+
     @staticmethod
     def event_key(e: "EventType") -> int:
         return e.counter
 
     def add_character(self, c: "Character", /):
         self.attendees[c] += 1
+        self.story.clear_cache()
 
 
 class EventAnchor(EventBase):
@@ -569,29 +834,70 @@ class EventAnchor(EventBase):
     "Events" on a Timeline for time synchronization
     """
 
+    __slots__ = ("child_events", "child_prefix", "child_kwargs")
     can_attend = False
 
     def __init__(
-        self, name: str, tl: Timeline, counter: int, make_related: bool = True, **kwargs
+        self,
+        name: str,
+        tl: Timeline,
+        counter: int,
+        make_related: bool = True,
+        lazy: bool = False,
+        **kwargs,
     ):
+        """
+        :param make_related: create an event in every place of the timeline
+        :param lazy: ...but only once something looks the event up (add_child)
+        """
         super().__init__(name, tl, counter, universal=make_related, **kwargs)
         if self.opener or self.closer:
             self.color = self.line.color
         self.child_events: "Set[Event]" = set()
         kwargs.pop("color", None)
-        if make_related:
-            self.child_events |= {
-                Event(
-                    f"{name}_{p.name}",
-                    p,
-                    self.counter,
-                    color=self.color,
-                    universal=True,
-                    **kwargs,
-                    absolute=True,
-                )
-                for p in tl.places
-            }
+        self.child_prefix: str = name
+        self.child_kwargs: Optional[Dict[str, Any]] = (
+            kwargs if make_related and lazy else None
+        )
+        if make_related and not lazy:
+            try:
+                for p in tl.places:
+                    self.child_events.add(
+                        Event(
+                            f"{name}_{p.name}",
+                            p,
+                            self.counter,
+                            color=self.color,
+                            universal=True,
+                            **kwargs,
+                            absolute=True,
+                        )
+                    )
+            except Exception:
+                for e in self.child_events:
+                    e.line.remove_event(e)
+                tl.remove_event(self)
+                raise
+
+    def add_child(self, p: "Place") -> "Event":
+        """Creates the event at p of a lazy universal event"""
+        assert self.child_kwargs is not None, f"{self.name} is not lazy"
+        return Event(
+            f"{self.child_prefix}_{p.name}",
+            p,
+            self.counter,
+            color=self.color,
+            universal=True,
+            **self.child_kwargs,
+            absolute=True,
+        )
+
+    @property
+    def pending_places(self) -> int:
+        """Places that a lazy universal event has no child event in (yet)"""
+        if self.child_kwargs is None:
+            return 0
+        return len(self.line.places) - len(self.child_events)
 
     @property
     def cluster_name(self) -> str:
@@ -599,7 +905,9 @@ class EventAnchor(EventBase):
 
     @property
     def dash(self) -> bool:
-        return all(e.dash for e in self.child_events)
+        return all(e.dash for e in self.child_events) and (
+            not self.pending_places or self.child_kwargs.get("dash", False)
+        )
 
     @property
     def node_label(self) -> str:
@@ -609,17 +917,29 @@ class EventAnchor(EventBase):
 
     @property
     def skip_arrow(self) -> bool:
-        return all(e.no_box for e in self.child_events)
+        return all(e.no_box for e in self.child_events) and (
+            not self.pending_places or self.no_box
+        )
 
-    def make_cluster(self, g_dir: str = "LR") -> gv.Digraph:
+    def make_cluster(
+        self,
+        g: "GraphType",
+        g_dir: str = "LR",
+        only: "Optional[Set[EventType]]" = None,
+    ) -> None:
+        """Draws this time box and its events as a subgraph of g"""
         ga: Dict[str, str] = {
             "label": f"{self.counter}",
             "gradientangle": self.grad_dir[g_dir],
             "color": self.color if self.color else "",
             "fontsize": "",
             "fontname": "",
-            "tooltip": self.tooltip_txt,
-            "URL": self.tooltip_js,
+            **self.story.tooltip_attrs(
+                f"c:{self.timeline.name}:{self.counter}",
+                self.tooltip_txt,
+                tooltip=self.tooltip_txt,
+                URL=self.tooltip_js,
+            ),
         }
         if self.dash:
             ga["style"] = "dashed"
@@ -643,25 +963,6 @@ class EventAnchor(EventBase):
             na["color"] = color
         if self.story.time_style == "LINE":
             ga["rank"] = "same"
-        c = gv.Digraph(
-            name=self.cluster_name if self.story.time_style == "BOX" else "",
-            graph_attr=ga,
-        )
-        for v in self.child_events:
-            use_event_color = v.color and not (self.opener or self.closer)
-            na["tooltip"] = v.tooltip_txt
-            na["URL"] = v.tooltip_js if v.roster else ""
-            if use_event_color:
-                na["color"] = v.color
-            if v.dash:
-                na["style"] = "dotted"
-            c.node(v.name, v.node_label, **na)
-            if (
-                use_event_color
-            ):  # clear color so it doesn't bleed over into other events
-                na.pop("color", "Blue")
-            if v.dash:
-                na.pop("style", None)
         ra: Dict[str, str] = {}
         if self.story.time_style == "BOX":
             ra["shape"] = "point"
@@ -670,8 +971,40 @@ class EventAnchor(EventBase):
             if ga.get("style"):
                 ra["style"] = ga["style"]
             ra["shape"] = "rectangle"
-        c.node(self.name, self.node_label, **ra)
-        return c
+        if self.pending_places and not (self.opener or self.closer):
+            # one node for every place without its own child event
+            ra["tooltip"] = f"{self.name} (in {self.pending_places} more places)"
+            if self.story.time_style == "BOX":
+                ra["shape"] = "box"
+                ra["style"] = "rounded,dashed"
+        with g.subgraph(
+            name=self.cluster_name if self.story.time_style == "BOX" else "",
+            graph_attr=ga,
+        ) as c:
+            for v in self.in_file_order(self.child_events):
+                if only is not None and v not in only:
+                    continue
+                use_event_color = v.color and not (self.opener or self.closer)
+                na.update(
+                    self.story.tooltip_attrs(
+                        f"n:{v.name}",
+                        v.tooltip_txt,
+                        tooltip=v.tooltip_txt,
+                        URL=v.tooltip_js if v.roster else "",
+                    )
+                )
+                if use_event_color:
+                    na["color"] = v.color
+                if v.dash:
+                    na["style"] = "dotted"
+                c.node(v.name, v.node_label, **na)
+                if (
+                    use_event_color
+                ):  # clear color so it doesn't bleed over into other events
+                    na.pop("color", "Blue")
+                if v.dash:
+                    na.pop("style", None)
+            c.node(self.name, self.node_label, **ra)
 
 
 class Event(EventBase):
@@ -679,6 +1012,8 @@ class Event(EventBase):
     Events in a Place that characters can attend
     """
 
+    __slots__ = ("anchor", "dash")
+
     def __init__(
         self, name: str, tl: Place, counter: int, **kwargs,
     ):
@@ -688,13 +1023,21 @@ class Event(EventBase):
         kwargs.pop("vegan", None)
         kwargs.pop("offset", None)
         self.dash = kwargs.pop("dash", False)
-        self.anchor = (
-            tl.timeline.ts[self.counter]
-            if self.counter in tl.timeline.ts.keys()
-            else EventAnchor(
-                f"{self.counter}", self.line.timeline, self.counter, False, **kwargs,
+        try:
+            self.anchor = (
+                tl.timeline.ts[self.counter]
+                if self.counter in tl.timeline.ts.keys()
+                else EventAnchor(
+                    f"{self.counter}",
+                    self.line.timeline,
+                    self.counter,
+                    False,
+                    **kwargs,
+                )
             )
-        )
+        except Exception:
+            tl.remove_event(self)  # no event without a time box
+            raise
         self.anchor.child_events.add(self)
         if self.opener or self.closer:
             name = tl.name + "_"
@@ -711,7 +1054,7 @@ class Event(EventBase):
     def can_attend(self) -> bool:
         return False if self.opener or self.closer else True
 
-    @property
+    @frozen_property
     def tooltip_txt(self) -> str:
         if self.opener or self.closer:
             return self.line.tooltip_txt
@@ -730,9 +1073,24 @@ class Event(EventBase):
 EventType = TypeVar("EventType", bound=EventBase)
 LineType = TypeVar("LineType", bound=TimedEventSequence)
 ESType = TypeVar("ESType", bound=EventConnector)
+StoryElementType = TypeVar("StoryElementType", bound=StoryElement)
 
 
 class EventBridge:
+    __slots__ = (
+        "seq",
+        "index",
+        "past",
+        "future",
+        "dash",
+        "show_name",
+        "show_number",
+        "display_attrs",
+        "child_bridges",
+        "dash_type",
+    )
+    no_attrs: Mapping[str, str] = {}  # shared by every bridge without any
+
     def __init__(
         self,
         seq: ESType,
@@ -752,8 +1110,8 @@ class EventBridge:
         self.dash = dash
         self.show_name = show_name
         self.show_number = show_number
-        self.display_attrs = display_attrs if display_attrs else {}
-        self.child_bridges: "List[EventBridge]" = []
+        self.display_attrs = display_attrs if display_attrs else self.no_attrs
+        self.child_bridges: "Sequence[EventBridge]" = ()  # a list once there are any
         self.dash_type = dash_type
 
     def line_str(self, show_name: bool = True, show_number: bool = True) -> str:
@@ -761,9 +1119,10 @@ class EventBridge:
             f"-{self.index}" if show_number else ""
         )
 
-    @property
-    def child_bridge_by_char(self) -> "Dict[ESType, EventBridge]":
-        return {b.seq: b for b in self.child_bridges}
+    def add_child_bridge(self, b: "EventBridge") -> None:
+        if not self.child_bridges:
+            self.child_bridges = []
+        self.child_bridges.append(b)
 
     @property
     def dash_link(self) -> bool:
@@ -775,18 +1134,28 @@ class EventBridge:
         return f"{self.index} Bridge from {self.past} to {self.future} for {self.seq}"
 
     def draw_line(
-        self, g: gv.Digraph, color_labels: bool = True, **override_attrs
+        self,
+        g: "GraphType",
+        color_labels: bool = True,
+        past_name: Optional[str] = None,
+        future_name: Optional[str] = None,
+        **override_attrs,
     ) -> None:
-        # inherent attributes
-        attrs = deepcopy(self.display_attrs)
-        for x in override_attrs:  # manual overrides
-            attrs[x] = override_attrs[x]  # can be a one-line in 3.9
+        """
+        :param past_name: node to draw from, instead of the past event
+        :param future_name: node to draw to, instead of the future event
+        """
+        # manual overrides, then inherent attributes shared by the sequence
+        attrs = ChainMap(override_attrs, self.display_attrs)
 
         # fancy Timeline rendering
         if isinstance(self.seq, Timeline):
             if self.seq.story.time_style == "BOX":
-                attrs["ltail"] = self.past.cluster_name
-                attrs["lhead"] = self.future.cluster_name
+                # a stub stands in for an end whose cluster is in another graph
+                if not past_name:
+                    attrs["ltail"] = self.past.cluster_name
+                if not future_name:
+                    attrs["lhead"] = self.future.cluster_name
                 attrs["arrowhead"] = "lvee" if self.index % 2 else "rvee"
             self.dash = True if self.past.dash or self.future.dash else False
 
@@ -805,12 +1174,21 @@ class EventBridge:
 
         # SVG tooltips for combined lines
         if len(self.child_bridges) > 1:
-            attrs["labeltooltip"] = "\n\t".join(
+            text = "\n\t".join(
                 [f"{self.past.name} -> {self.future.name}: {attrs['label']}"]
                 + [b.line_str() for b in self.child_bridges]
             )
+            inline: Dict[str, str] = {"labeltooltip": text}
             if not attrs.get("URL"):
-                attrs["URL"] = StoryElement.jsa(attrs["labeltooltip"])
+                inline["URL"] = StoryElement.jsa(text)
+            # a combiner can take the same link more than once
+            attrs.update(
+                self.seq.story.tooltip_attrs(
+                    f"b:{self.seq.name}:{self.past.name}:{self.future.name}:{self.index}",
+                    text,
+                    **inline,
+                )
+            )
 
         # assign estimated straightness
         if "weight" not in attrs.keys():
@@ -818,7 +1196,9 @@ class EventBridge:
 
         # draw the edge on the graph
         try:
-            g.edge(self.past.name, self.future.name, **attrs)
+            g.edge(
+                past_name or self.past.name, future_name or self.future.name, **attrs
+            )
         except TypeError:
             click.echo(attrs, err=True)
 
@@ -842,6 +1222,16 @@ class EventBridge:
 
 
 class Character(EventSequence):
+    __slots__ = StoryElement.element_slots + (
+        "name",
+        "bridges",
+        "e_lst",
+        "dash_by_default",
+        "skip_in_friendship_graph",
+        "mask",
+        "solo_combiner",
+    )
+
     def __init__(self, s: "Storyboard", name: str, *event_list: str, **kwargs):
         assert (
             name not in s.dramatis_personae.keys()
@@ -852,13 +1242,12 @@ class Character(EventSequence):
         else:
             self.skip_in_friendship_graph = False
         super().__init__(name, s, **kwargs)
-        s.dramatis_personae[name] = self
-        Combiner(s, name, self)
         if self.short_name != self.name:
             assert (
                 self.short_name not in s.dramatis_personae.keys()
             ), f"{self.short_name} is already taken as a character (short)name"
-            s.dramatis_personae[self.short_name] = self
+        # find every event first, so that a bad row adds nothing to the story
+        path: "List[Tuple[Event, bool, bool]]" = []
         for e in event_list:
             e = e.strip().lower()
             if not e:
@@ -870,22 +1259,35 @@ class Character(EventSequence):
                 e = e[:-2]
             if dash_previous:
                 e = e[2:]
-            self.add_event(s.event_list[e], dash_previous, dash_next)
+            event: Event = s.find_event(e)
+            assert (
+                event.can_attend
+            ), f"{self} cannot attend a synchronization marker, {event}"
+            path.append((event, dash_previous, dash_next))
+        s.dramatis_personae[name] = self
+        self.mask: int = 1 << len(s.cast)  # bit position for Combiner matching
+        s.cast.append(self)
+        self.solo_combiner = Combiner(s, name, self)
+        if self.short_name != self.name:
+            s.dramatis_personae[self.short_name] = self
+        for event, dash_previous, dash_next in path:
+            self.add_event(event, dash_previous, dash_next)
         if self.events:
             self.events[0].entrances.add(self)
             self.events[0].anchor.entrances.add(self)
             self.latest_event.exits.add(self)
             self.latest_event.anchor.exits.add(self)
+        s.clear_cache()
 
     def __repr__(self) -> str:
         return f"Character {self.name}"
 
-    @property
+    @frozen_property
     def roster(self) -> "Set[Character]":
         """This is the list of characters met along the way"""
         return super().roster - (set() if self.has_loop else {self})
 
-    @property
+    @frozen_property
     def mod_roster(self) -> "Set[Character]":
         ros: "Set[Character]" = set()
         for e in self.events:
@@ -899,7 +1301,10 @@ class Character(EventSequence):
         # add yourself to the roster of the events you attend
         e.add_character(self)
 
-    def draw_friendships(self, g: gv.Graph) -> None:
+    def draw_friendships(
+        self, g: "GraphType", only: "Optional[Set[Character]]" = None
+    ) -> None:
+        """:param only: the characters to draw lines to, if not everyone"""
         if self.skip_in_friendship_graph:
             return
         n = self.name
@@ -907,27 +1312,31 @@ class Character(EventSequence):
         c = self.color if self.color else dc
         t = f"Meets {len(self.roster)} others"
         t += " (looper)" if self.has_loop else ""
-        u = self.jsa(
+        u = (
             (
-                (
-                    f"{n} meets\n➡"
-                    + "\n➡".join(
-                        f"{x.name}\t({self.count_meetings(x)[0]} times)"
-                        for x in self.roster
-                    )
+                f"{n} meets\n➡"
+                + "\n➡".join(
+                    f"{x.name}\t({self.count_meetings(x)[0]} times)"
+                    for x in self.roster
                 )
-                if self.roster
-                else f"{n} is lonely"
             )
-            + f"\nover {len(set(self.events))} events"
-        )
+            if self.roster
+            else f"{n} is lonely"
+        ) + f"\nover {len(set(self.events))} events"
         g.node(
-            n, color=c, tooltip=t, shape="signature", URL=u,
+            n,
+            color=c,
+            shape="signature",
+            **self.story.tooltip_attrs(
+                f"f:{n}", f"{t}\n{u}", tooltip=t, URL=self.jsa(u)
+            ),
         )
         general_args: Dict[str, str] = {
             "penwidth": "2",
         }
         for r in self.mod_roster:
+            if only is not None and r not in only:
+                continue
             x = r.color if r.color else dc
             rn = r.name
             color = f"{c}:{x}"
@@ -939,36 +1348,56 @@ class Character(EventSequence):
                     continue
                 color, d = c, "forward"
                 tt = f"{n}\n{m} self-encounters"
+            shared = tt + ":\n➡" + "\n➡".join(n.name for n in self.shared_events(r))
             g.edge(
                 n,
                 rn,
                 **general_args,
                 color=color,
                 dir=d,
-                tooltip=tt + f" over {e} events",
                 weight="0" if r == self else str(m),
                 labelfontname="monospace",
                 labelfontsize="8",
-                URL=self.jsa(
-                    tt + ":\n➡" + "\n➡".join(n.name for n in self.shared_events(r))
+                **self.story.tooltip_attrs(
+                    f"f:{n}--{rn}",
+                    f"{shared}\nover {e} events",
+                    tooltip=tt + f" over {e} events",
+                    URL=self.jsa(shared),
                 ),
             )
 
     def shared_events(self, c: "Character") -> Set[Event]:
-        return {e for e in self.events if e.attendees[c] > (1 if c == self else 0)}
+        met: "Optional[Meetings]" = self.story.meetings.get(self, {}).get(c)
+        return set(met.events) if met else set()
 
     def count_meetings(self, c: "Character") -> Tuple[int, int]:
         """
+        Looks up the co-attendance table, see Storyboard.meetings
         :param c: who did you meet?
         :return: how many times did you meet over how many events?
         """
-        meeting_list: List[int] = [
-            e.attendees[c] - (1 if c == self else 0) for e in set(self.events)
-        ]
-        return sum(meeting_list), len([i for i in meeting_list if i > 0])
+        met: "Optional[Meetings]" = self.story.meetings.get(self, {}).get(c)
+        if not met:
+            return 0, 0
+        return met.times, len(met.events)
+
+
+class Meetings(NamedTuple):
+    """How often one Character meets another, see Storyboard.meetings"""
+
+    times: int
+    events: "List[Event]"
 
 
 class Combiner(Set[Character], EventConnector):
+    __slots__ = StoryElement.element_slots + (
+        "name",
+        "bridges",
+        "chars",
+        "mask",
+        "priority",
+    )
+
     def __init__(
         self, s: "Storyboard", name: str, *chars: Union[Character, str], **kwargs
     ):
@@ -977,14 +1406,17 @@ class Combiner(Set[Character], EventConnector):
         )
         EventConnector.__init__(self, name, s, **kwargs)
         set.__init__(self, self.chars)
+        self.mask: int = Combiner.mask_of(self.chars)
         if len(chars) == 1:  # called from the Character.__init__
             self.color = chars[0].color
             self.short_name = chars[0].short_name
         assert self not in s.grouped_roster, f"A combiner with {chars} already exists"
         s.grouped_roster.add(self)
+        s.combiner_index_cache = None
+        s.clear_cache()
         self.priority: int = kwargs.get("num", 0)
 
-    @property
+    @frozen_property
     def roster(self) -> "Set[Character]":
         return set(self.chars)
 
@@ -994,10 +1426,24 @@ class Combiner(Set[Character], EventConnector):
     def __hash__(self):
         return self.chars.__hash__()
 
+    def __reduce_ex__(self, protocol):
+        return (
+            restore_element,
+            (type(self), self.serial, self.chars),
+            self.__getstate__(),
+        )
+
     @staticmethod
     def size_key(c: "Combiner") -> int:
         return len(c.chars) * 1000 + c.priority
 
+    @staticmethod
+    def mask_of(chars: "Iterable[Character]") -> int:
+        mask: int = 0
+        for c in chars:
+            mask |= c.mask
+        return mask
+
     def build_bridges(self) -> None:
         """
         Generates index numbers for all bridges
@@ -1007,32 +1453,389 @@ class Combiner(Set[Character], EventConnector):
                 b.index = b.child_bridges[0].index
             return
         index_char: Character = sorted(self.chars, key=lambda c: len(c.events))[-1]
+        # Storyboard.build_bridges adds child bridges in the order of self.chars
+        pos: int = list(self.chars).index(index_char)
         for x, b in enumerate(
-            sorted(self.bridges, key=lambda z: z.child_bridge_by_char[index_char].index)
+            sorted(self.bridges, key=lambda z: z.child_bridges[pos].index)
         ):
             b.index = x + 1
 
 
+class StoryRow(NamedTuple):
+    line: int
+    type: str
+    name: str
+    color: str
+    short_name: str
+    args: Tuple[str, ...]
+
+    header = ("TYPE", "NAME", "COLOR", "SHORTNAME")
+
+
+class Selection(NamedTuple):
+    """The part of a story to draw; empty fields select everything"""
+
+    start: Optional[int] = None
+    end: Optional[int] = None
+    characters: Tuple[str, ...] = ()
+    places: Tuple[str, ...] = ()
+
+
+class Profiler:
+    """
+    Wall time, CPU time, and peak RSS for each phase of building and
+    rendering a story
+    cpu_s is the CPU time of the thread running the phase, so the phases
+    of concurrent renders (see render_all) can be summed; process_cpu_s is
+    that of the whole process and its Graphviz subprocesses, which counts
+    whatever else ran at the same time
+    """
+
+    phase_names = ("parse", "snapshot", "finalize", "bridges", "graph", "dot", "render")
+    edge = re.compile(r'("(?:[^"\\]|\\.)*"|[^\s"]+) (->|--) ')
+    node = re.compile(r'("(?:[^"\\]|\\.)*"|[^\s"=\[]+)( \[|$)')
+
+    def __init__(self, cprofile_phase: Optional[str] = None, cprofile_prefix: str = ""):
+        """
+        :param cprofile_phase: also run this phase under cProfile
+        :param cprofile_prefix: start of the .prof file names
+        """
+        self.phases: List[Dict[str, Any]] = []
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.cprofile_phase = cprofile_phase
+        self.cprofile_prefix = cprofile_prefix
+
+    @contextmanager
+    def phase(self, name: str, graph: Optional[str] = None):
+        prof = cProfile.Profile() if name == self.cprofile_phase else None
+        wall, cpu, process_cpu = (
+            time.perf_counter(),
+            time.thread_time(),
+            self.process_cpu_time(),
+        )
+        if prof:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+                prof.dump_stats(
+                    f"{self.cprofile_prefix}.{name}"
+                    + (f".{graph}" if graph else "")
+                    + ".prof"
+                )
+            record: Dict[str, Any] = {"phase": name}
+            if graph:
+                record["graph"] = graph
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.thread_time() - cpu, 6)
+            record["process_cpu_s"] = round(self.process_cpu_time() - process_cpu, 6)
+            record["peak_rss_mib"] = self.peak_rss_mib()
+            self.phases.append(record)
+
+    @staticmethod
+    def process_cpu_time() -> float:
+        t = os.times()
+        return t.user + t.system + t.children_user + t.children_system
+
+    @staticmethod
+    def peak_rss_mib() -> Optional[float]:
+        """High-water mark of this process so far (None without `resource`)"""
+        if not resource:
+            return None
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(kb / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+    def count_graph(self, g: "GraphType") -> None:
+        self.counts[g.name] = self.graph_counts(g)
+
+    @classmethod
+    def graph_counts(cls, g: "GraphType") -> Dict[str, int]:
+        if isinstance(g, DotWriter):  # counted as it was written
+            return dict(g.counts)
+        c: Dict[str, int] = {"nodes": 0, "edges": 0, "clusters": 0}
+        for line in g.body:
+            line = line.lstrip("\t")
+            if line.startswith("subgraph "):
+                c["clusters"] += line[9:].strip('"').startswith("cluster")
+            elif cls.edge.match(line):
+                c["edges"] += 1
+            elif (m := cls.node.match(line)) and m[1] not in ("graph", "node", "edge"):
+                c["nodes"] += 1
+        return c
+
+    def report(self) -> str:
+        return json.dumps({"phases": self.phases, "graphs": self.counts}, indent=2)
+
+
+class RenderCache:
+    """
+    Rendered files stored under a hash of the DOT source, engine, and format
+    The least recently used files are evicted once max_bytes is exceeded
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(source: str, engine: str, fmt: str) -> str:
+        return hashlib.sha256(f"{engine}\0{fmt}\0{source}".encode()).hexdigest()
+
+    @staticmethod
+    def file_key(path: str, engine: str, fmt: str) -> str:
+        """key() of a UTF-8 DOT file, read a block at a time"""
+        h = hashlib.sha256(f"{engine}\0{fmt}\0".encode())
+        with open(path, "rb") as f:
+            while block := f.read(1 << 20):
+                h.update(block)
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def fetch(self, key: str, target: str) -> bool:
+        """Copies a cached file to target, if there is one"""
+        try:
+            shutil.copyfile(self.path(key), target)
+            os.utime(self.path(key))  # mark as recently used
+        except FileNotFoundError:  # never stored, or evicted by another process
+            return False
+        return True
+
+    def store(self, key: str, rendered: str) -> None:
+        """
+        Copies rendered in under a temporary name first, so that other
+        processes sharing the cache never fetch a half-written file
+        """
+        tmp: str = f"{self.path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(rendered, tmp)
+        os.replace(tmp, self.path(key))
+        with self.lock:
+            self.evict()
+
+    def evict(self) -> None:
+        entries: List[Tuple[float, int, str]] = []
+        for e in os.scandir(self.directory):
+            if not e.is_file() or e.name.endswith(".tmp"):  # still being stored
+                continue
+            try:
+                stat = e.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, e.path))
+        entries.sort()
+        total: int = sum(e[1] for e in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # another process got to it first
+            total -= size
+
+
+class DotWriter:
+    """
+    Writes DOT to {name}.gv as it is drawn instead of keeping it in a body
+    The text is what gv.Graph/gv.Digraph would have produced for the same
+    calls, for the parts of their API that the storyboard uses
+    The file is only open while a batch of text is flushed to it, so that
+    any number of partitions can be drawn at once
+    """
+
+    engine: str = "dot"
+    encoding: str = "utf-8"
+    buffer_size: int = 1 << 18  # characters held before they are flushed
+    quote_id = staticmethod(lru_cache(maxsize=2 ** 12)(quote))
+    quote_edge_id = staticmethod(lru_cache(maxsize=2 ** 12)(quote_edge))
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        directed: bool = True,
+        strict: bool = False,
+        graph_attr: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.filepath: str = f"{name}.gv"
+        self.arrow: str = " -> " if directed else " -- "
+        self.counts: Dict[str, int] = {"nodes": 0, "edges": 0, "clusters": 0}
+        self.indent: str = ""
+        self.pending: List[str] = []
+        self.pending_size: int = 0
+        self.flushed: bool = False  # the file has been started
+        self.closed: bool = False
+        kind: str = ("strict " if strict else "") + ("digraph" if directed else "graph")
+        self.emit(f"{kind} {self.quote_id(name)} {{\n")
+        if graph_attr:
+            self.attr("graph", **graph_attr)
+
+    @staticmethod
+    @lru_cache(maxsize=2 ** 12)
+    def quote_attr(k: str, v: str) -> str:
+        return f"{quote(k)}={quote(v)}"
+
+    def a_list(self, label: Optional[str], attrs: Dict[str, str]) -> str:
+        out: List[str] = [] if label is None else [f"label={self.quote_id(label)}"]
+        out += [
+            self.quote_attr(k, v) for k, v in sorted(attrs.items()) if v is not None
+        ]
+        return " ".join(out)
+
+    def attr_list(self, label: Optional[str], attrs: Dict[str, str]) -> str:
+        a: str = self.a_list(label, attrs)
+        return f" [{a}]" if a else ""
+
+    def emit(self, text: str) -> None:
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size > self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends what has been drawn so far to the file"""
+        if not self.pending:
+            return
+        with open(
+            self.filepath, "a" if self.flushed else "w", encoding=self.encoding
+        ) as f:
+            f.writelines(self.pending)
+        self.flushed = True
+        self.pending, self.pending_size = [], 0
+
+    def write(self, statement: str) -> None:
+        self.emit(f"{self.indent}\t{statement}\n")
+
+    def attr(self, kw: Optional[str] = None, **attrs) -> None:
+        if not attrs:
+            return
+        if kw:
+            self.write(f"{kw}{self.attr_list(None, attrs)}")
+        else:
+            self.write(self.a_list(None, attrs))
+
+    def node(self, name: str, label: Optional[str] = None, **attrs) -> None:
+        self.counts["nodes"] += 1
+        self.write(f"{self.quote_id(name)}{self.attr_list(label, attrs)}")
+
+    def edge(self, tail: str, head: str, label: Optional[str] = None, **attrs) -> None:
+        self.counts["edges"] += 1
+        self.write(
+            self.quote_edge_id(tail)
+            + self.arrow
+            + self.quote_edge_id(head)
+            + self.attr_list(label, attrs)
+        )
+
+    @contextmanager
+    def subgraph(
+        self, name: Optional[str] = None, graph_attr: Optional[Dict[str, str]] = None
+    ) -> Iterator["DotWriter"]:
+        """Like gv's subgraph(name=...) block, but written in place"""
+        self.counts["clusters"] += bool(name and name.startswith("cluster"))
+        self.write(f"subgraph {self.quote_id(name)} {{" if name else "{")
+        self.indent += "\t"
+        if graph_attr:
+            self.attr("graph", **graph_attr)
+        yield self
+        self.emit(f"{self.indent}}}\n")
+        self.indent = self.indent[:-1]
+
+    def close(self) -> None:
+        if not self.closed:
+            self.emit("}\n")
+            self.flush()
+            self.closed = True
+
+
+GraphType = Union[gv.Graph, gv.Digraph, DotWriter]
+
+@lru_cache(maxsize=None)
+def asset(name: str) -> str:
+    """
+    A script or page template from the static folder next to this file
+    The pages only work when served (python -m http.server), as browsers
+    won't fetch one file:// from another
+    """
+    return (Path(__file__).with_name("static") / name).read_text(encoding="utf-8")
+
+
+class Layout(NamedTuple):
+    """A way to lay out a graph, for --time-style auto"""
+
+    time_style: str
+    engine: str
+    graph_attr: Dict[str, str]
+    max_size: float  # of graphs it is picked for, see Storyboard.layout_size
+
+
+class Tile(NamedTuple):
+    """A run of a Timeline's time boxes drawn as a graph of its own (partition)"""
+
+    timeline: Timeline
+    index: int  # of its first time box over Storyboard.tile_size
+
+
 class Storyboard(EventConnector):
+    snapshot_magic: bytes = b"PLOTDMG-SNAPSHOT"
+    snapshot_version: int = 8  # bump whenever the pickled classes change
+    # most faithful (and slowest) first; sizes are rough guesses for dot
+    layouts: List[Layout] = [
+        Layout("BOX", "dot", {}, 4_000),
+        Layout("LINE", "dot", {"newrank": "true", "mclimit": "0.5"}, 20_000),
+        Layout(
+            "LINE",
+            "dot",
+            {"newrank": "true", "mclimit": "0.1", "nslimit": "2", "splines": "line"},
+            60_000,
+        ),
+        Layout("LINE", "sfdp", {"overlap": "prism", "splines": "false"}, float("inf")),
+    ]
+    auto_budget: float = 600.0  # seconds per render in auto mode, unless given
+
     def __init__(
         self,
         *,
         name: Optional[str] = None,
         file=None,
         load_final: bool = True,
+        watch: bool = False,
         g_attr: Optional[Dict[str, str]] = None,
         time_style: str = "BOX",
+        render_cache: "Optional[RenderCache]" = None,
+        render_jobs: int = 1,
+        profiler: "Optional[Profiler]" = None,
+        partition: bool = False,
+        selection: "Optional[Selection]" = None,
+        lazy_universal: bool = False,
+        auto_combine: int = 0,
+        stream: bool = False,
+        layout_budget: Optional[float] = None,
+        tooltips: str = "inline",
+        tile_size: int = 0,
         **kwargs,
     ):
         assert name or file, f"Need a name or a file to load from"
+        assert not (
+            watch and (partition or tile_size)
+        ), f"Cannot watch a partitioned story"
+        assert not (watch and stream), f"Cannot watch a streamed story"
         if not name:
-            name = file.split(".tsv")[0]
+            name = self.name_of(file)
+        self.element_count: int = 0
         super().__init__(name, self, **kwargs)
 
         # set up all the blank variables
         self.line_list: Dict[str, LineType] = {}
         self.event_list: Dict[str, Event] = {}
         self.is_final: bool = False
+        self.derived_cache: Dict[Tuple[int, str], Any] = {}
         self.line_loaders: Dict[str, Callable] = {
             "TIMELINE": self.create_timeline,
             "EVENT": self.create_event,
@@ -1042,22 +1845,37 @@ class Storyboard(EventConnector):
             "OBJECT": self.create_character,
         }
         self.dramatis_personae: Dict[str, Character] = {}
-        self.graph = gv.Digraph(name=self.name)
-        self.graph.attr(compound="True", **g_attr)
         self.timelines: Set[Timeline] = set()
         self.places: Set[Place] = set()
-        self.direction: str = g_attr.get("rankdir", "LR")
-        self.color_names: bool = kwargs.get("color_names")
-        self.friendships = gv.Graph(
-            name=f"{self.name}~friendships",
-            strict=True,
-            graph_attr={"fontname": "signature"},
-        )
         self.links2process: DefaultDict[
             Tuple[EventType, EventType], List[EventBridge]
-        ] = defaultdict(lambda: [])
+        ] = defaultdict(list)
         self.grouped_roster: Set[Combiner] = set()
-        self.time_style = time_style.strip().upper()
+        self.combiner_index_cache: Optional[List[Combiner]] = None
+        self.cast: List[Character] = []  # indexed by bit position
+        self.meetings_cache: "Optional[Dict[Character, Dict]]" = None  # see meetings
+        self.lazy_universal: bool = lazy_universal  # see EventAnchor.add_child
+        self.auto_combine: int = auto_combine  # see infer_combiners
+        self.configure(
+            g_attr=g_attr,
+            time_style=time_style,
+            render_cache=render_cache,
+            render_jobs=render_jobs,
+            profiler=profiler,
+            color_names=kwargs.get("color_names"),
+            partition=partition,
+            selection=selection,
+            stream=stream,
+            layout_budget=layout_budget,
+            tooltips=tooltips,
+            tile_size=tile_size,
+        )
+        self.watching: bool = watch  # keep what make_graph(reuse=self) needs
+        self.rows: Optional[List[StoryRow]] = [] if watch else None
+        self.fragments: Dict[  # deps, dot lines, and tooltips of each piece
+            Tuple[str, str], Tuple[Set[Tuple[str, str]], List[str], Dict[str, str]]
+        ] = {}
+        self.fragments_reused: int = 0
 
         if not file:
             return
@@ -1066,78 +1884,460 @@ class Storyboard(EventConnector):
             self.finalize()
             self.make_graph()
 
-    def load_file(self, file, /):
-        f = csv.DictReader(open(file, "r"), delimiter="\t")
-        l: int = 0
-        for line in f:
-            if not line["TYPE"].strip():
-                continue  # skip blank lines without throwing an error
-            fn: Callable = self.line_loaders.get(line["TYPE"].upper().strip())
-            if not fn:
-                click.echo(f"invalid line: {line}", err=True)
-                continue
-            color: Optional[str] = line["COLOR"].strip() if line["COLOR"] else None
-            everything_else: List[str] = line.get(None, [])  # noqa
-            try:
-                fn(
-                    line["NAME"],
-                    line["SHORTNAME"],
-                    *everything_else,
-                    color=color,
-                    num=(l := l + 1),
-                )
-            except (KeyError, AssertionError) as e:
-                assert False, f"{e}\n{l}\t{line}"
-
-    @property
-    def nested_lines(self) -> "Dict[Timeline, Set[Place]]":
-        return {t: t.places for t in self.timelines}
+    @staticmethod
+    def name_of(file: str) -> str:
+        """:return: the path that output for file is written to, minus extensions"""
+        return file.split(".tsv")[0]
 
-    @property
-    def location_count(self) -> int:
-        return sum(len(v) for v in self.nested_lines.values())
+    def configure(
+        self,
+        *,
+        g_attr: Dict[str, str],
+        time_style: str = "BOX",
+        render_cache: "Optional[RenderCache]" = None,
+        render_jobs: int = 1,
+        profiler: "Optional[Profiler]" = None,
+        color_names: bool = False,
+        partition: bool = False,
+        selection: "Optional[Selection]" = None,
+        stream: bool = False,
+        layout_budget: Optional[float] = None,
+        tooltips: str = "inline",
+        tile_size: int = 0,
+        **_kwargs,
+    ) -> None:
+        """Settings for drawing and rendering, which snapshots leave out"""
+        self.g_attr: Dict[str, str] = g_attr
+        self.auto_layout: bool = time_style.strip().upper() == "AUTO"
+        if self.auto_layout:
+            time_style = self.layouts[0].time_style
+            layout_budget = layout_budget or self.auto_budget
+        self.layout_budget = layout_budget  # seconds for each graph's render
+        self.layout_of: Dict[str, int] = {}  # graph name -> index in layouts
+        self.timed_out: Set[str] = set()  # graph names, until fall_back
+        self.stream: bool = stream  # graphs are DotWriters
+        self.graph: Optional[GraphType] = None  # see make_graph
+        self.direction: str = g_attr.get("rankdir", "LR")
+        self.color_names: bool = color_names
+        self.friendships: Optional[GraphType] = None
+        self.time_style = time_style.strip().upper()
+        self.render_cache = render_cache
+        self.render_jobs: int = render_jobs
+        self.profiler = profiler
+        self.partition: bool = partition or tile_size > 0  # one graph per Tile
+        self.tile_size: int = tile_size  # time boxes per Tile, 0 for a whole Timeline
+        self.partitions: Dict[Tile, GraphType] = {}
+        self.partition_links: Counter[Tile] = Counter()
+        self.selection = selection
+        self.selected: "Optional[Set[EventType]]" = None  # None is everything
+        self.selected_cast: "Optional[Set[Character]]" = None
+        self.tooltip_sidecar: bool = tooltips.strip().lower() == "sidecar"
+        self.tooltips: Dict[str, str] = {}  # id -> text, see tooltip_attrs
+
+    def tooltip_attrs(self, key: str, text: str, **inline: str) -> Dict[str, str]:
+        """
+        :param key: an id for the node, edge, or cluster, made of names so that
+            it stays the same when an edit (see watch) renumbers the elements
+        :param inline: the tooltip and URL attributes that show text in the graph
+        :return: inline, or with a tooltip sidecar, just the id to look text up by
+        """
+        if not self.tooltip_sidecar:
+            return inline
+        if text:
+            self.tooltips[key] = text
+        return {"id": key}
+
+    def storyline(self, name: str) -> GraphType:
+        g = DotWriter(name) if self.stream else gv.Digraph(name=name)
+        g.attr(compound="True", **self.g_attr)
+        return g
 
-    def finalize(self):
+    def friendship_graph(self) -> GraphType:
+        name: str = f"{self.name}~friendships"
+        attrs: Dict[str, str] = {"fontname": "signature"}
+        if self.stream:
+            return DotWriter(name, directed=False, strict=True, graph_attr=attrs)
+        return gv.Graph(name=name, strict=True, graph_attr=attrs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        for k in (
+            "name",  # the output path, set again by load_snapshot
+            "key",
+            "short_name",
+            "graph",
+            "friendships",
+            "render_cache",
+            "profiler",
+            "rows",
+            "selected",
+            "selected_cast",
+            "meetings_cache",  # quick to build again, and big
+        ):
+            state[k] = None
+        state["tooltips"] = {}
+        state["partitions"] = {}
+        state["derived_cache"] = {}  # keyed by id(), which changes on load
+        state["watching"] = False
+        state["fragments"] = {}
+        state["fragments_reused"] = 0
+        return state
+
+    @classmethod
+    def snapshot_header(
+        cls, source: str, lazy_universal: bool = False, auto_combine: int = 0
+    ) -> bytes:
+        """
+        Format version, a hash of the .tsv file a snapshot was made from,
+        and the settings that change how it was parsed
+        """
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        return b"%s %d %s %d %d\n" % (
+            cls.snapshot_magic,
+            cls.snapshot_version,
+            digest.hexdigest().encode(),
+            lazy_universal,
+            auto_combine,
+        )
+
+    @staticmethod
+    def snapshot_key() -> bytes:
+        """
+        Secret for signing snapshots, kept in the user's config directory
+        rather than next to the .tsv files anyone else may write to
+        """
+        path = os.path.join(click.get_app_dir("plotdmg"), "snapshot.key")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        key = os.urandom(32)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # made by a concurrent run
+            with open(path, "rb") as f:
+                return f.read()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    @classmethod
+    def snapshot_signature(cls, f: BinaryIO, header: bytes) -> bytes:
+        """HMAC of the header and everything from f's position onward"""
+        mac = hmac.new(cls.snapshot_key(), header, hashlib.sha256)
+        while chunk := f.read(1 << 20):
+            mac.update(chunk)
+        return mac.hexdigest().encode()
+
+    def save_snapshot(self, path: str, source: str) -> None:
+        """Writes the parsed and finalized story so load_snapshot can skip both"""
+        assert self.is_final, f"Cannot snapshot {self.name} before it is finalized"
+        header = self.snapshot_header(source, self.lazy_universal, self.auto_combine)
+        with open(f"{path}.tmp", "w+b") as f, bulk_pickling():
+            f.write(header)
+            f.write(b"0" * 64 + b"\n")  # signed once the pickle is written
+            pickled = f.tell()
+            SnapshotPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(self)
+            f.seek(pickled)
+            signature = self.snapshot_signature(f, header)
+            f.seek(len(header))
+            f.write(signature)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load_snapshot(cls, path: str, source: str, **kwargs) -> "Optional[Storyboard]":
+        """
+        :param kwargs: drawing and rendering settings, as for Storyboard()
+        :return: the story saved in path, ready to draw and output,
+            or None if there is no snapshot of the current source
+        """
+        profiler: Optional[Profiler] = kwargs.get("profiler")
+        start: float = time.perf_counter()
+        try:
+            with open(path, "rb") as f, (
+                profiler.phase("snapshot") if profiler else nullcontext()
+            ):
+                header = cls.snapshot_header(
+                    source,
+                    kwargs.get("lazy_universal", False),
+                    kwargs.get("auto_combine", 0),
+                )
+                if f.readline() != header:
+                    return None
+                signature = f.readline().rstrip()
+                pickled = f.tell()
+                if not hmac.compare_digest(
+                    signature, cls.snapshot_signature(f, header)
+                ):
+                    click.echo(f"Ignoring snapshot {path} not made by you", err=True)
+                    return None
+                f.seek(pickled)
+                with bulk_pickling():
+                    s = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            click.echo(f"Ignoring unreadable snapshot {path}: {e}", err=True)
+            return None
+        if not isinstance(s, cls):
+            return None
+        click.echo(
+            f"Loaded snapshot {path} in {time.perf_counter() - start:.3f}s", err=True
+        )
+        s.name = cls.name_of(source)
+        s.key, s.short_name = s.name.lower(), s.name
+        s.configure(**kwargs)
+        return s
+
+    @profiled("parse")
+    def load_file(self, file, /, buffer_size: int = 1 << 20):
+        """
+        Streams the rows of a .tsv file into the story
+        Every row that fails is reported together once the whole file is read
+        """
+        l: int = 0
+        errors: List[str] = []
+        start: float = time.perf_counter()
+        for line in self.read_rows(file, buffer_size):
+            if not line.type.strip():
+                continue  # skip blank lines without throwing an error
+            if self.rows is not None:
+                self.rows.append(line)
+            fn: Callable = self.line_loaders.get(line.type.upper().strip())
+            if not fn:
+                click.echo(f"invalid line: {line}", err=True)
+                continue
+            color: Optional[str] = line.color.strip() if line.color else None
+            try:
+                fn(
+                    line.name,
+                    line.short_name,
+                    *line.args,
+                    color=color,
+                    num=(l := l + 1),
+                )
+            except (LookupError, AssertionError, ValueError, AttributeError) as e:
+                # the row's elements were checked or undone before raising,
+                # so later rows see the story as if it had been left out
+                if isinstance(e, KeyError):
+                    e = f"{e.args[0]} not found"
+                errors.append(f"{file}:{line.line}: {e}\n\t{line}")
+        elapsed: float = time.perf_counter() - start
+        click.echo(
+            f"Loaded {l} rows in {elapsed:.3f}s ({l / elapsed if elapsed else 0:.0f} rows/sec)",
+            err=True,
+        )
+        assert not errors, f"{len(errors)} bad rows in {file}\n" + "\n".join(errors)
+
+    @staticmethod
+    def read_rows(file, buffer_size: int = 1 << 20) -> "Iterator[StoryRow]":
+        """Yields the rows after the header without holding the whole file"""
+        with (
+            nullcontext(sys.stdin)
+            if file == "-"
+            else open(file, "r", newline="", buffering=buffer_size)
+        ) as f:
+            r = csv.reader(f, delimiter="\t")
+            header: List[str] = next(r, [])
+            col: Dict[str, int] = {h: i for i, h in enumerate(header)}
+            assert all(
+                h in col for h in StoryRow.header
+            ), f"{file} needs a header row with {', '.join(StoryRow.header)}"
+            width: int = len(header)
+            for row in r:
+                if not row:
+                    continue
+                row += [""] * (width - len(row))
+                yield StoryRow(
+                    r.line_num,
+                    row[col["TYPE"]],
+                    row[col["NAME"]],
+                    row[col["COLOR"]],
+                    row[col["SHORTNAME"]],
+                    tuple(row[width:]),
+                )
+
+    def clear_cache(self) -> None:
+        """Any change to the story invalidates values from frozen_property"""
+        self.derived_cache.clear()
+        self.meetings_cache = None
+
+    @property
+    def nested_lines(self) -> "Dict[Timeline, Set[Place]]":
+        return {t: t.places for t in self.timelines}
+
+    @property
+    def location_count(self) -> int:
+        return sum(len(v) for v in self.nested_lines.values())
+
+    @profiled("finalize")
+    def finalize(self):
         """Adds start/end events for better graph output"""
         if self.is_final:
             return
         for t in self.timelines:
             t.add_cap()
         for t in set(self.line_list.values()):
-            t.sort_events()
             t.build_bridges()
         for c in self.roster:
             c.build_bridges()
+        if self.auto_combine:
+            self.infer_combiners(self.auto_combine)
         self.build_bridges()  # more like sort/process bridges
         self.is_final = True
 
+    @property
+    def meetings(self) -> "Dict[Character, Dict[Character, Meetings]]":
+        """
+        The character x character table of shared events, built in one pass
+        the first time it is needed (only the friendship graph uses it)
+        meetings[a][b] is how many times a meets b, and at which events
+        (self-meetings are loops)
+        """
+        if self.meetings_cache is not None:
+            return self.meetings_cache
+        self.meetings_cache = {c: {} for c in self.roster}
+        for e in {e for e in self.event_list.values() if e.can_attend}:
+            for a in e.attendees:
+                row = self.meetings_cache[a]
+                for b, n in e.attendees.items():
+                    if (m := n - (1 if a is b else 0)) > 0:
+                        times, events = row.get(b) or (0, [])
+                        events.append(e)
+                        row[b] = Meetings(times + m, events)
+        return self.meetings_cache
+
+    @profiled("bridges")
     def build_bridges(self):
         """This should be called sort_bridges"""
         for past, future in self.links2process:
-            y = []
+            y: "Dict[Character, Deque[EventBridge]]" = {}  # loopers may cross twice
+            mask: int = 0
             for bridge in self.links2process[past, future]:
                 if isinstance(bridge.seq, Character):
-                    y.append(bridge)
+                    y.setdefault(bridge.seq, deque()).append(bridge)
+                    mask |= bridge.seq.mask
                 else:
                     self.bridges.append(bridge)
-            while y:  # convert Character lines into Combiner lines
-                c_out = self.longest_matching_combiner(b.seq for b in y)
+            # convert Character lines into Combiner lines
+            for c_out in self.split_link(Counter({c: len(q) for c, q in y.items()})):
                 b = EventBridge(c_out, 0, past, future)
                 for c in c_out.chars:
-                    e: EventBridge = [r for r in y if r.seq == c][0]
-                    y.remove(e)
-                    b.child_bridges.append(e)
+                    b.add_child_bridge(y[c].popleft())
                 c_out.bridges.append(b)
         for combo in self.grouped_roster:
             combo.build_bridges()
             self.bridges.extend(combo.bridges)
 
+    def split_link(self, crossings: "Counter[Character]") -> "Iterator[Combiner]":
+        """
+        :param crossings: how many times each character takes one link
+        :return: the Combiner of each line drawn for the link, longest first
+        """
+        mask: int = Combiner.mask_of(crossings)
+        while mask:
+            c_out = self.combiner_for_mask(mask)
+            for c in c_out.chars:
+                crossings[c] -= 1
+                if not crossings[c]:
+                    mask &= ~c.mask
+            yield c_out
+
+    def character_links(
+        self,
+    ) -> "Dict[Tuple[EventType, EventType], Counter[Character]]":
+        """How many times each character takes each link"""
+        return {
+            link: Counter(b.seq for b in bridges if isinstance(b.seq, Character))
+            for link, bridges in self.links2process.items()
+        }
+
+    def infer_combiners(self, min_run: int) -> "List[Combiner]":
+        """
+        Creates a Combiner for each group of characters who take at least
+        min_run links in a row together, so their lines are drawn as one
+        Runs are found greedily along each character's path: the group is
+        whoever shares every link of the run with it, while that's 2 or more
+        :return: the new Combiners
+        """
+        links = self.character_links()
+        masks: Dict[Tuple[EventType, EventType], int] = {
+            link: Combiner.mask_of(crossings) for link, crossings in links.items()
+        }
+        before: int = sum(len(list(self.split_link(+x))) for x in links.values())
+        known: Set[int] = {k.mask for k in self.grouped_roster}
+        found: Dict[int, None] = {}  # in the order they were found
+        for c in self.cast:
+            run, length = 0, 0  # characters sharing the last `length` links
+            for b in c.bridges + [None]:  # None ends the last run
+                group = masks[b.past, b.future] if b else 0
+                if length and bin(run & group).count("1") > 1:
+                    run, length = run & group, length + 1
+                    continue
+                if length >= min_run and run not in known:
+                    found[run] = None
+                run, length = group, int(bin(group).count("1") > 1)
+        made: List[Combiner] = []
+        for mask in found:
+            chars = [c for c in self.cast if c.mask & mask]
+            k = Combiner(
+                self,
+                "+".join(c.name for c in chars),
+                *chars,
+                short_name="+".join(c.short_name for c in chars),
+            )
+            made.append(k)
+            # as a row that can be pasted into the story
+            click.echo(
+                "\t".join(
+                    ["Combiner", k.name, "", k.short_name, *(c.name for c in chars)]
+                ),
+                err=True,
+            )
+        after: int = sum(len(list(self.split_link(+x))) for x in links.values())
+        click.echo(
+            f"Combined {len(made)} groups of characters who share {min_run}+ links:"
+            f" {before} character lines became {after} ({before - after} saved)",
+            err=True,
+        )
+        return made
+
     @property
+    def combiner_index(self) -> "List[Combiner]":
+        """
+        Multi-character combiners, highest Combiner.size_key first
+        Single characters are matched directly in combiner_for_mask
+        """
+        if self.combiner_index_cache is None:
+            self.combiner_index_cache = sorted(
+                [k for k in self.grouped_roster if len(k.chars) > 1],
+                key=Combiner.size_key,
+            )[::-1]
+        return self.combiner_index_cache
+
+    def combiner_for_mask(self, mask: int) -> "Optional[Combiner]":
+        """
+        :param mask: bits of the characters still waiting for a line
+        :return: the longest combiner that fits within mask
+        """
+        if not mask:
+            return None
+        for combo in self.combiner_index:
+            if not combo.mask & ~mask:
+                return combo
+        return self.cast[(mask & -mask).bit_length() - 1].solo_combiner
+
+    @frozen_property
     def events(self) -> "List[EventType]":
         """Returns a list of events that characters may attend"""
         return [e for e in self.event_list.values() if e.can_attend]
 
-    @property
+    @frozen_property
     def timeboxen(self) -> "Set[EventType]":
         """
         Returns the list of event anchors created by the story
@@ -1149,14 +2349,12 @@ class Storyboard(EventConnector):
             if not e.can_attend and not (e.opener or e.closer)
         }
 
-    def output(self, quiet: bool = False, formats: List[str] = None):
-        if formats is None:
-            formats = ["pdf"]
-        else:
-            formats = [f.strip().lower() for f in formats]
+    @property
+    def stats(self) -> str:
+        """What output prints, which only needs the story to be finalized"""
         if not self.is_final:
-            self.make_graph()
-        stats = "\n".join(
+            self.finalize()
+        return "\n".join(
             [
                 f"{len(self.events)} events",
                 f"\t(sorted into {len(self.timeboxen)} timeboxen)",
@@ -1165,44 +2363,757 @@ class Storyboard(EventConnector):
                 f"{len(set(self.line_list.values()))} timelines and places",  # always plural
             ]
         )
+
+    def output(
+        self, quiet: bool = False, formats: List[str] = None, render: bool = True
+    ):
+        """
+        Prints the stats, then writes the .gv files and renders them
+        :param render: stop after writing the .gv files
+        """
+        if formats is None:
+            formats = ["pdf"]
+        else:
+            formats = [f.strip().lower() for f in formats]
+        if not self.friendships:
+            self.make_graph()
+        stats = self.stats
         click.echo(stats)
-        self.graph.attr(tooltip=f"{self.name}\n{stats}")
         for f in formats:
-            if not f:
-                continue
-            try:
-                self.graph.render(format=f, quiet_view=False if quiet else True)
-                self.friendships.render(format=f, quiet_view=False if quiet else True)
-            except ValueError:
+            if f and f not in gv.FORMATS:
                 click.echo(f"Skipping invalid format {f}", err=True)
+        formats = [f for f in formats if f in gv.FORMATS]
+        redraw: bool = False
+        while True:  # until it renders, falling back to cheaper layouts if allowed
+            if self.auto_layout:
+                self.fit_layouts(redraw)
+            graphs = [*self.storylines, self.friendships]
+            for g in self.storylines:
+                g.attr(tooltip=f"{self.name}\n{stats}")
+            if self.profiler:
+                for g in graphs:
+                    self.profiler.count_graph(g)
+            if not (formats and render):
+                for g in graphs:
+                    self.write_source(g)
+                break
+            try:
+                self.render_all(graphs, formats, quiet)
+                break
+            except subprocess.TimeoutExpired:
+                if not (redraw := self.fall_back()):
+                    raise
+        if self.tooltip_sidecar:
+            sidecar: str = self.write_tooltips(graphs, formats if render else [])
+            click.echo(f"Tooltips: {sidecar}")
+        if self.partitions:
+            pages: List[str] = formats if render else []
+            viewer = self.write_viewer(stats) if "svg" in pages else None
+            index: str = self.write_index(pages, stats, viewer)
+            click.echo(f"Index of partitions: {index}")
+            if viewer:
+                click.echo(f"Tiled viewer: {viewer}")
+
+    @property
+    def storylines(self) -> List[GraphType]:
+        return list(self.partitions.values()) or [self.graph]
+
+    @staticmethod
+    def layout_size(counts: Dict[str, int]) -> float:
+        """Weighs clusters the most, as BOX lines are clipped to them"""
+        return counts["nodes"] + counts["edges"] + 10 * counts["clusters"]
+
+    def fit_layouts(self, redraw: bool = False) -> None:
+        """
+        Gives every graph the most faithful of the layouts that it is small
+        enough for, and that hasn't already run out of time (layout_of)
+        All storylines get the same one, as they share a time style
+        :param redraw: draw the graphs again even if the time style stays
+        """
+
+        def fit(g: GraphType) -> int:
+            size = self.layout_size(Profiler.graph_counts(g))
+            least = self.layout_of.get(g.name, 0)
+            return next(
+                i
+                for i, x in enumerate(self.layouts)
+                if i >= least and size <= x.max_size
+            )
+
+        chosen: int = max(fit(g) for g in self.storylines)
+        if redraw or self.layouts[chosen].time_style != self.time_style:
+            self.time_style = self.layouts[chosen].time_style
+            for g in (*self.storylines, self.friendships):
+                if isinstance(g, DotWriter):
+                    g.close()
+            self.make_graph()
+        for g in self.storylines:
+            self.layout_of[g.name] = chosen
+        self.layout_of[self.friendships.name] = fit(self.friendships)
+        for g in (*self.storylines, self.friendships):
+            layout = self.layouts[self.layout_of[g.name]]
+            g.engine = layout.engine
+            g.attr(**layout.graph_attr)
+            click.echo(
+                f"Laying out {g.name} with {layout.engine}"
+                + ("" if g is self.friendships else f" in {self.time_style} style")
+                + "".join(f", {k}={v}" for k, v in layout.graph_attr.items()),
+                err=True,
+            )
+
+    def fall_back(self) -> bool:
+        """
+        Moves the graphs that ran out of time on to cheaper layouts
+        :return: whether they all had one to move on to
+        """
+        late, self.timed_out = self.timed_out, set()
+        if not self.auto_layout:
+            return False
+        storylines = self.storylines
+        for group in (storylines, [self.friendships]):  # storylines move together
+            if not late & {g.name for g in group}:
                 continue
+            cheaper: int = self.layout_of.get(group[0].name, 0) + 1
+            if cheaper == len(self.layouts):
+                return False
+            click.echo(
+                f"{', '.join(g.name for g in group if g.name in late)} took over"
+                f" {self.layout_budget:g}s to lay out; trying a cheaper layout",
+                err=True,
+            )
+            for g in group:
+                self.layout_of[g.name] = cheaper
+        return True
+
+    def write_index(
+        self, formats: List[str], stats: str, viewer: Optional[str] = None
+    ) -> str:
+        """
+        Writes an HTML page linking the rendered graph of every Tile
+        :param viewer: the path of the write_viewer page, if there is one
+        :return: the path of the page
+        """
+
+        def links(g: GraphType) -> str:
+            return " ".join(
+                f'<a href="{html.escape(os.path.basename(g.filepath))}.{f}">{f}</a>'
+                for f in pages
+            )
+
+        pages: List[str] = list(formats)
+        if self.tooltip_sidecar and "svg" in formats:
+            pages.append("svg.html")  # see write_tooltips
+
+        others: str = "tiles" if self.tile_size else "timelines"
+        rows: List[str] = [
+            f"<li>{html.escape(self.tile_label(x))}: {links(g)}"
+            f" ({self.partition_links[x]} lines to other {others})</li>"
+            for x, g in self.partitions.items()
+        ]
+        rows.append(f"<li>Friendships: {links(self.friendships)}</li>")
+        if viewer:
+            href: str = html.escape(os.path.basename(viewer))
+            rows.insert(0, f'<li><a href="{href}">All of them, tiled</a></li>')
+        path: str = f"{self.name}.html"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                '<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+                f"<title>{html.escape(self.name)}</title></head>\n<body>\n"
+                f"<h1>{html.escape(self.name)}</h1>\n<pre>{html.escape(stats)}</pre>\n"
+                "<ul>\n" + "\n".join(rows) + "\n</ul>\n</body>\n</html>\n"
+            )
+        return path
+
+    def write_tooltips(self, graphs: List[GraphType], formats: List[str]) -> str:
+        """
+        Writes the text of every tooltip_attrs id to one JSON file, and if
+        there are SVGs, a page for each that shows it on hover
+        :return: the path of the JSON file
+        """
+        path: str = f"{self.name}.tooltips.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.tooltips, f, ensure_ascii=False, separators=(",", ":"))
+        if "svg" in formats:
+            for g in graphs:
+                svg: str = f"{os.path.basename(g.filepath)}.svg"
+                with open(f"{g.filepath}.svg.html", "w", encoding="utf-8") as f:
+                    f.write(
+                        Template(asset("tooltips.html")).substitute(
+                            title=html.escape(g.name),
+                            script=asset("tooltips.js"),
+                            svg=json.dumps(svg),
+                            tooltips=json.dumps(os.path.basename(path)),
+                        )
+                    )
+        return path
 
-    def make_graph(self) -> None:
-        """Converts the loaded data into a graph"""
+    def write_viewer(self, stats: str) -> str:
+        """
+        Writes an HTML page that shows the SVG of every partition as a tile,
+        loading only the ones near where the reader pans and zooms to
+        Its contents list the time boxes and events of each tile
+        :return: the path of the page
+        """
+        box: bool = self.time_style == "BOX"  # else find a time box by its node
+        timelines = self.in_file_order({x.timeline for x in self.partitions})
+        lines: Dict[Timeline, List[Dict[str, Any]]] = {}
+        for x, only in self.tile_events(timelines).items():
+            boxes: List[Tuple[str, str, List[str]]] = [
+                (
+                    f"{a.counter}",
+                    a.cluster_name if box else a.name,
+                    [
+                        v.name
+                        for v in a.in_file_order(a.child_events)
+                        if only is None or v in only
+                    ],
+                )
+                for a in self.tile_boxes(x)
+                if only is None or a in only
+            ]
+            lines.setdefault(x.timeline, []).append(
+                {
+                    "svg": f"{os.path.basename(self.partitions[x].filepath)}.svg",
+                    "label": self.tile_label(x),
+                    "boxes": boxes,
+                }
+            )
+        data = [{"name": t.name, "tiles": tiles} for t, tiles in lines.items()]
+        across: bool = self.direction in ("LR", "RL")
+        friends: str = html.escape(f"{os.path.basename(self.friendships.filepath)}.svg")
+        sidecar: Optional[str] = None  # see write_tooltips
+        if self.tooltip_sidecar:
+            sidecar = f"{os.path.basename(self.name)}.tooltips.json"
+        path: str = f"{self.name}.viewer.html"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                Template(asset("viewer.html")).substitute(
+                    title=html.escape(self.name),
+                    stats=html.escape(stats),
+                    friendships=f'<a href="{friends}">Friendships</a>',
+                    lines="column" if across else "row",
+                    tiles={"LR": "row", "RL": "row-reverse", "TB": "column"}.get(
+                        self.direction, "column-reverse"
+                    ),
+                    tooltip_script=asset("tooltips.js"),
+                    script=asset("viewer.js"),
+                    data=json.dumps(data, ensure_ascii=False).replace("</", "<\\/"),
+                    tooltips=json.dumps(sidecar),
+                )
+            )
+        return path
+
+    def phase(self, name: str, graph: Optional[str] = None) -> ContextManager:
+        return self.profiler.phase(name, graph) if self.profiler else nullcontext()
+
+    def render_all(
+        self,
+        graphs: List[GraphType],
+        formats: List[str],
+        quiet: bool,
+    ) -> None:
+        """
+        Renders independent graphs on up to render_jobs threads
+        Every failed graph is reported before the first failure is raised
+        """
+
+        def job(g: GraphType) -> float:
+            start: float = time.perf_counter()
+            self.render(g, formats, quiet)
+            return time.perf_counter() - start
+
+        errors: List[Exception] = []
+        with ThreadPoolExecutor(max_workers=self.render_jobs) as pool:
+            jobs = {pool.submit(job, g): g for g in graphs}
+            for done in as_completed(jobs):
+                try:
+                    click.echo(f"Rendered {jobs[done].name} in {done.result():.2f}s")
+                except (subprocess.SubprocessError, OSError, RuntimeError) as e:
+                    click.echo(f"Failed to render {jobs[done].name}: {e}", err=True)
+                    errors.append(e)
+        if errors:  # a timeout first, so output can fall back to another layout
+            raise next(
+                (e for e in errors if isinstance(e, subprocess.TimeoutExpired)),
+                errors[0],
+            )
+
+    def render(self, g: GraphType, formats: List[str], quiet: bool) -> List[str]:
+        """
+        Lays g out once and writes every format from that layout
+        Formats already in the render cache are copied instead
+        :return: paths of the rendered files
+        """
+        src: str = g.filepath
+        key = self.write_source(g)
+        todo: List[str] = []
+        for f in formats:
+            if not (
+                self.render_cache and self.render_cache.fetch(key(f), f"{src}.{f}")
+            ):
+                todo.append(f)
+        if todo:
+            cmd = [g.engine, *(f"-T{f}" for f in todo), "-O", src]
+            try:
+                with self.phase("render", g.name):
+                    subprocess.run(cmd, check=True, timeout=self.layout_budget)
+            except subprocess.TimeoutExpired:
+                self.timed_out.add(g.name)
+                raise
+            except FileNotFoundError as e:
+                raise gv.ExecutableNotFound(cmd) from e
+        if self.render_cache:
+            for f in todo:
+                self.render_cache.store(key(f), f"{src}.{f}")
+        if not quiet:
+            for f in formats:
+                gv.view(f"{src}.{f}", quiet=True)
+        return [f"{src}.{f}" for f in formats]
+
+    def write_source(self, g: GraphType) -> Callable[[str], str]:
+        """
+        Writes (or finishes writing) g.filepath
+        :return: the RenderCache.key of the file for a given format
+        """
+        with self.phase("dot", g.name):
+            if isinstance(g, DotWriter):
+                g.close()
+                return partial(RenderCache.file_key, g.filepath, g.engine)
+            source: str = g.source
+            with open(g.filepath, "w", encoding=g.encoding) as f:
+                f.write(source)
+            return partial(RenderCache.key, source, g.engine)
+
+    @profiled("graph")
+    def make_graph(self, reuse: "Optional[Storyboard]" = None) -> None:
+        """
+        Converts the loaded data into a graph
+        :param reuse: an earlier build of the same file (watch mode only)
+            whose pieces are copied when nothing they depend on has changed
+        """
         if not self.is_final:
             self.finalize()
-        # 1. create timelines, timeboxen, and events
-        for t in self.timelines:
-            self.graph.subgraph(
-                t.make_graph(
+        dirty = self.changes_since(reuse) if reuse else None
+        if self.selection:
+            self.selected, self.selected_cast = self.select(self.selection)
+        timelines = self.in_file_order(
+            self.timelines
+            if self.selected is None
+            else {e.timeline for e in self.selected}
+        )
+        # made here, so a story that is never drawn (or fails to load) has none
+        self.tooltips = {}  # filled again by every piece, drawn or reused
+        self.graph = None if self.partition else self.storyline(self.name)
+        self.friendships = self.friendship_graph()
+        tiles = self.tile_events(timelines)
+        lines_of: Dict[Tile, List[EventBridge]] = {}
+        self.partition_links = Counter()
+        if self.partition:
+            self.partitions = {x: self.storyline(self.tile_name(x)) for x in tiles}
+            for b in self.bridges if self.selected is None else self.selected_bridges():
+                for x in {self.tile_of(b.past), self.tile_of(b.future)}:
+                    lines_of.setdefault(x, []).append(b)
+        # 1. create timelines, timeboxen, and events (and the lines of partitions,
+        # so that each one is finished before the next, see DotWriter.flush)
+        for x, only in tiles.items():
+            self.add_fragment(
+                self.partitions.get(x, self.graph),
+                ("timeline", x.timeline.name),
+                {("timeline", x.timeline.name)},
+                lambda g, t=x.timeline, only=only: t.make_graph(
+                    g,
                     only_one=True if len(self.timelines) < 2 else False,
                     direction=self.direction,
                     color_names=self.color_names,
-                )
+                    only=only,
+                ),
+                reuse,
+                dirty,
             )
+            if self.partition:
+                self.draw_bridges(lines_of.get(x, ()), x)
+                if isinstance(self.partitions[x], DotWriter):
+                    self.partitions[x].flush()
         # 2. make the friendship graph
         for c in self.roster:
-            c.draw_friendships(self.friendships)
+            if self.selected_cast is not None and c not in self.selected_cast:
+                continue
+            self.add_fragment(
+                self.friendships,
+                ("friends", c.name),
+                {("character", c.name), ("met", c.name)}
+                | {("character", x.name) for x in self.meetings.get(c, {})},
+                partial(c.draw_friendships, only=self.selected_cast),
+                reuse,
+                dirty,
+            )
         # 3. add connecting lines to the graph
+        if self.partition:
+            return
+        if self.selected is not None:
+            self.draw_bridges(self.selected_bridges())
+            return
+        if not self.watching:
+            for b in self.bridges:
+                b.draw_line(self.graph, color_labels=self.color_names)
+            return
+        by_seq: "Dict[ESType, List[EventBridge]]" = {}
         for b in self.bridges:
-            b.draw_line(self.graph, color_labels=self.color_names)
+            by_seq.setdefault(b.seq, []).append(b)
+        for seq, bridges in by_seq.items():
+            deps: Set[Tuple[str, str]] = {
+                ("timeline", e.timeline.name)
+                for b in bridges
+                for e in (b.past, b.future)
+            }
+            if isinstance(seq, Combiner):
+                deps |= {("character", c.name) for c in seq.chars}
 
-    @property
+            def draw(g: gv.Digraph, bridges=bridges) -> None:
+                for b in bridges:
+                    b.draw_line(g, color_labels=self.color_names)
+
+            self.add_fragment(
+                self.graph, ("edges", repr(seq)), deps, draw, reuse, dirty
+            )
+
+    def select(
+        self, sel: Selection
+    ) -> "Tuple[Set[EventType], Optional[Set[Character]]]":
+        """
+        Finds the events in sel (and their time boxes) from the sorted
+        timestamps of each Place or the event lists of the chosen characters
+        :return: the selected events, and the chosen characters
+            or else everyone at those events
+        """
+        lines: Set[Place] = set()
+        for n in sel.places:
+            assert (line := self.line_list.get(n.lower().strip())), f"No place {n}"
+            lines |= line.places if isinstance(line, Timeline) else {line}
+        cast: Optional[Set[Character]] = None
+        chosen: Set[EventType] = set()
+        if sel.characters:
+            cast = set()
+            for n in sel.characters:
+                assert (c := self.dramatis_personae.get(n.strip())), f"No character {n}"
+                cast.add(c)
+                chosen.update(
+                    e
+                    for e in c.events
+                    if (sel.start is None or e.counter >= sel.start)
+                    and (sel.end is None or e.counter <= sel.end)
+                    and (not lines or e.line in lines)
+                )
+        else:
+            for p in lines or self.places:
+                chosen.update(p.events_between(sel.start, sel.end))
+        assert chosen, f"Nothing in {self.name} matches {sel}"
+        if cast is None:
+            cast = {c for e in chosen for c in e.attendees}
+        return chosen | {e.anchor for e in chosen}, cast
+
+    def tile_of(self, e: EventType) -> Tile:
+        t: Timeline = e.timeline
+        if not self.tile_size:
+            return Tile(t, 0)
+        return Tile(t, bisect_left(t.sorted_ts, e.counter) // self.tile_size)
+
+    def tile_events(
+        self, timelines: "Iterable[Timeline]"
+    ) -> "Dict[Tile, Optional[Set[EventType]]]":
+        """
+        :return: the tiles with anything selected in them, in order, and the
+            time boxes and events of each (None for all of its Timeline)
+        """
+        if not self.tile_size:
+            return {Tile(t, 0): self.selected for t in timelines}
+        tiles: Dict[Tile, Set[EventType]] = {}
+        if self.selected is None:
+            for t in timelines:
+                for a in t.events:
+                    tiles.setdefault(self.tile_of(a), set()).update(
+                        [a, *a.child_events]
+                    )
+            return tiles
+        for e in self.selected:  # a child event is in the tile of its time box
+            tiles.setdefault(self.tile_of(e), set()).add(e)
+        order: Dict[Timeline, int] = {t: i for i, t in enumerate(timelines)}
+        return dict(
+            sorted(tiles.items(), key=lambda x: (order[x[0].timeline], x[0].index))
+        )
+
+    def tile_name(self, x: Tile) -> str:
+        name: str = f"{self.name}~{x.timeline.name}"
+        return f"{name}~{x.index + 1}" if self.tile_size else name
+
+    def tile_label(self, x: Tile) -> str:
+        """:return: the Timeline, and the times it covers if it is split"""
+        if not self.tile_size:
+            return x.timeline.name
+        boxes = self.tile_boxes(x)
+        return f"{x.timeline.name} {boxes[0].counter}–{boxes[-1].counter}"
+
+    def tile_boxes(self, x: Tile) -> "List[EventType]":
+        """:return: the time boxes of x, selected or not"""
+        size: int = self.tile_size or len(x.timeline.events)
+        return x.timeline.events[x.index * size : (x.index + 1) * size]
+
+    def selected_bridges(self) -> "List[EventBridge]":
+        """
+        Lines of the selected characters that touch a selected event, plus
+        Timeline and Place lines that join their selected events in order
+        Only the lines of the selected characters and events are looked at
+        """
+        out: List[EventBridge] = [
+            b
+            for combo in self.in_file_order(self.grouped_roster)
+            if combo.chars & self.selected_cast
+            for b in combo.bridges
+            if b.past in self.selected or b.future in self.selected
+        ]
+        path: Dict[LineType, List[int]] = {}  # see bridge_position
+        for e in self.selected:
+            if (i := e.line.bridge_position(e)) is not None:
+                path.setdefault(e.line, []).append(i)
+        for line in self.in_file_order(path):
+            stops: List[int] = sorted(path[line])
+            for i, j in zip(stops, stops[1:]):
+                start, b = line.bridges[i], line.bridges[j - 1]
+                out.append(
+                    start
+                    if start is b
+                    else EventBridge(
+                        b.seq,
+                        start.index,
+                        start.past,
+                        b.future,
+                        start.dash,
+                        start.show_name,
+                        start.show_number,
+                        start.display_attrs,
+                        start.dash_type,
+                    )
+                )
+        return out
+
+    def draw_bridges(
+        self, bridges: "Iterable[EventBridge]", tile: Optional[Tile] = None
+    ) -> None:
+        """
+        Draws each line in the graph of its Tile (see partition); a line that
+        leaves that graph or the selection ends at a stub for the other end
+        Lines between two partitions are drawn in both
+        :param tile: only draw (the ends of) lines that are in this partition
+        """
+        stubs: Set[Tuple[str, EventType]] = set()
+        only: Optional[GraphType] = self.partitions[tile] if tile else None
+
+        def graph_of(e: EventType) -> GraphType:
+            return self.partitions.get(self.tile_of(e), self.graph)
+
+        def stub(g: GraphType, e: EventType, selected: bool) -> str:
+            name: str = f"{e.name}~{e.timeline.name}"
+            if (g.name, e) in stubs:
+                return name
+            stubs.add((g.name, e))
+            attrs: Dict[str, str] = {
+                "shape": "cds",
+                "style": "dashed",
+                "color": e.timeline.color or "",
+            }
+            if selected:  # drawn in another partition
+                attrs["tooltip"] = f"{e.name} is in {e.timeline.name}"
+                attrs["URL"] = f"{os.path.basename(graph_of(e).filepath)}.svg"
+            else:
+                attrs["tooltip"] = f"{e.name} is outside the selection"
+            g.node(name, f"{e.node_label}\n({e.timeline.name})", **attrs)
+            return name
+
+        for b in bridges:
+            keep_past: bool = self.selected is None or b.past in self.selected
+            keep_future: bool = self.selected is None or b.future in self.selected
+            here, there = graph_of(b.past), graph_of(b.future)
+            if keep_past and keep_future and here is there:
+                b.draw_line(here, color_labels=self.color_names)
+                continue
+            if keep_past and (only is None or only is here):
+                b.draw_line(
+                    here,
+                    color_labels=self.color_names,
+                    future_name=stub(here, b.future, keep_future),
+                )
+            if keep_future and (only is None or only is there):
+                b.draw_line(
+                    there,
+                    color_labels=self.color_names,
+                    past_name=stub(there, b.past, keep_past),
+                )
+            if keep_past and keep_future:
+                for x in (self.tile_of(b.past), self.tile_of(b.future)):
+                    if tile is None or tile == x:
+                        self.partition_links[x] += 1
+
+    def add_fragment(
+        self,
+        target: GraphType,
+        key: Tuple[str, str],
+        deps: Set[Tuple[str, str]],
+        draw: Callable,
+        reuse: "Optional[Storyboard]",
+        dirty: Optional[Set[Tuple[str, str]]],
+    ) -> None:
+        """
+        Draws part of a graph, or copies it (and its tooltips) from reuse
+        when none of its dependencies (old or new) are dirty
+        """
+        if not self.watching:
+            draw(target)
+            return
+        old = reuse.fragments.get(key) if reuse and dirty is not None else None
+        if old and not (old[0] | deps) & dirty:
+            _, lines, tips = old
+            self.fragments_reused += 1
+        else:
+            g = target.__class__()
+            outer, self.tooltips = self.tooltips, {}
+            try:
+                draw(g)
+            finally:
+                tips, self.tooltips = self.tooltips, outer
+            lines = g.body
+        self.fragments[key] = deps, lines, tips
+        self.tooltips.update(tips)
+        target.body += lines
+
+    def changes_since(self, old: "Storyboard") -> Optional[Set[Tuple[str, str]]]:
+        """
+        Compares the rows of two loads of the same file
+        :return: the timelines and characters touched by the edit
+            or None if everything needs to be redrawn
+        """
+        if old.rows is None or self.rows is None:
+            return None
+        if (len(old.timelines), old.time_style, old.direction) != (
+            len(self.timelines),
+            self.time_style,
+            self.direction,
+        ):
+            return None
+        before = Counter(r[1:] for r in old.rows)
+        after = Counter(r[1:] for r in self.rows)
+        changed = list(((before - after) + (after - before)).elements())
+        combos = [
+            [r[1:] for r in x.rows if r.type.upper().strip() == "COMBINER"]
+            for x in (old, self)
+        ]
+        kept = [[r for r in c if r in before and r in after] for c in combos]
+        if kept[0] != kept[1]:  # reordering changes priority
+            changed += combos[0] + combos[1]
+        dirty: Set[Tuple[str, str]] = set()
+        for kind, name, _, _, args in changed:
+            kind = kind.upper().strip()
+            if kind == "TIMELINE":
+                return None
+            for story in (old, self):
+                if kind == "EVENT":
+                    if args and (line := story.line_list.get(args[0].lower().strip())):
+                        tl = line if isinstance(line, Timeline) else line.timeline
+                        dirty.add(("timeline", tl.name))
+                    if e := story.event_list.get(name.lower().strip()):
+                        dirty |= {("met", c.name) for c in e.attendees}
+                    continue
+                if kind in ("CHARACTER", "OBJECT"):
+                    names = [name[:-1] if name.endswith("*") else name]
+                elif kind == "COMBINER":
+                    names = args
+                else:
+                    continue
+                for n in names:
+                    if not (c := story.dramatis_personae.get(n)):
+                        continue
+                    dirty.add(("character", c.name))
+                    dirty |= {("timeline", e.timeline.name) for e in c.events}
+        return dirty
+
+    @classmethod
+    def watch(
+        cls,
+        file: str,
+        quiet: bool = False,
+        formats: List[str] = None,
+        interval: float = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Renders file, then renders it again each time it is saved
+        Only the timelines, friendships, and lines touched by an edit are redrawn
+        """
+        s = cls(file=file, watch=True, **kwargs)
+        s.output(quiet, formats)
+        stamp: int = os.stat(file).st_mtime_ns
+        click.echo(f"Watching {file} for changes (Ctrl+C to stop)", err=True)
+        try:
+            while True:
+                time.sleep(interval)
+                # a failed edit is reported and the last good graph is kept
+                try:
+                    if (m := os.stat(file).st_mtime_ns) == stamp:
+                        continue
+                    stamp = m
+                    new = cls(file=file, watch=True, load_final=False, **kwargs)
+                    new.make_graph(reuse=s)
+                    click.echo(
+                        f"Reused {new.fragments_reused} of {len(new.fragments)} graph pieces",
+                        err=True,
+                    )
+                    new.output(True, formats)  # viewers are already open
+                except FileNotFoundError:
+                    continue  # mid-way through an editor's atomic save
+                except (
+                    OSError,
+                    ValueError,
+                    AssertionError,
+                    subprocess.SubprocessError,
+                ) as e:
+                    click.echo(f"{file}: {e}", err=True)
+                    continue
+                s = new
+        except KeyboardInterrupt:
+            pass
+
+    @frozen_property
     def roster(self) -> "Set[Character]":
         return set(self.dramatis_personae.values())
 
+    def find_event(self, name: str) -> "EventType":
+        """
+        Looks up an event by its lowercase name
+        The child of a lazy universal event is created the first time it is found
+        """
+        if e := self.event_list.get(name):
+            return e
+        for i, sep in enumerate(name):
+            if sep not in "-_":
+                continue
+            anchor = self.event_list.get(name[:i])
+            place = self.line_list.get(name[i + 1 :])
+            if (
+                isinstance(anchor, EventAnchor)
+                and anchor.child_kwargs is not None
+                and isinstance(place, Place)
+                and place.timeline is anchor.line
+            ):
+                return anchor.add_child(place)
+        raise KeyError(name)
+
     def create_timeline(self, name: str, short_name: str, *places: str, **kwargs):
         places = [p for p in places if p]
+        # check every name first, so that a bad row adds nothing to the story
+        key: str = (name if places else f"{name}-tl").strip().lower()
+        keys: List[str] = list({key, (short_name or key).lower()}) + [
+            HasTimeOffset.separate_tz(p)[0].strip().lower() for p in places or [name]
+        ]
+        taken = [k for k in keys if k in self.line_list.keys() or keys.count(k) > 1]
+        assert not taken, f"{', '.join(set(taken))} already is a timeline or place"
         t = Timeline(
             self, name if places else f"{name}-tl", short_name=short_name, **kwargs,
         )
@@ -1230,7 +3141,9 @@ class Storyboard(EventConnector):
         return (
             Event(name, line, int(timestamp), **kwargs)
             if isinstance(line, Place)
-            else EventAnchor(name, line, int(timestamp), **kwargs)
+            else EventAnchor(
+                name, line, int(timestamp), lazy=self.lazy_universal, **kwargs
+            )
         )
 
     def create_character(self, name: str, short_name: str, *events: str, **kwargs):
@@ -1281,6 +3194,8 @@ class Storyboard(EventConnector):
     Invalid formats are skipped.
     
     Output files all end with '.gv*': run 'rm *.gv*' to clean up.
+    --partition, --tile, and --tooltips sidecar also write .html and
+    .tooltips.json files, and --snapshot writes LOADFILE.snap.
     Input tsv files are left untouched.
     """,
 )
@@ -1291,6 +3206,22 @@ class Storyboard(EventConnector):
     is_flag=True,
     help="Do not open the output file(s) immediately after render.",
 )
+@click.option(
+    "--emit",
+    type=click.Choice(["render", "dot"], case_sensitive=False),
+    default="render",
+    show_default=True,
+    help="Stop after writing the .gv files (dot) instead of rendering them.",
+)
+@click.option(
+    "--stats-only",
+    type=click.BOOL,
+    is_flag=True,
+    help="""
+    Load and check the story and print its numbers, without drawing any
+    graphs.  Fails like any other run when the story has errors.
+    """,
+)
 @click.option(
     "-c",
     "--color-names",
@@ -1301,25 +3232,273 @@ class Storyboard(EventConnector):
 @click.option(
     "-t",
     "--time-style",
-    type=click.Choice(["LINE", "BOX"], case_sensitive=False),
+    type=click.Choice(["LINE", "BOX", "AUTO"], case_sensitive=False),
     default="BOX",
-    help="Anchor simultaneous events to a timeline or group them in a time box?",
+    help="""
+    Anchor simultaneous events to a timeline or group them in a time box?
+    
+    AUTO picks a time style, layout engine, and layout options to suit the
+    size of each graph, and moves on to a cheaper layout whenever one takes
+    longer than --layout-budget.
+    """,
+)
+@click.option(
+    "--layout-budget",
+    type=click.FloatRange(min=1),
+    metavar="SECONDS",
+    help="Stop Graphviz after this long on any one graph (10 minutes for -t auto)",
+)
+@click.option(
+    "-w",
+    "--watch",
+    type=click.BOOL,
+    is_flag=True,
+    help="""
+    Keep running and render again every time LOADFILE is saved.
+    
+    Only the timelines, friendships, and lines touched by the edit are rebuilt.
+    """,
+)
+@click.option(
+    "-p",
+    "--partition",
+    type=click.BOOL,
+    is_flag=True,
+    help="""
+    Render each Timeline as its own graph, plus LOADFILE.html to link them.
+    
+    Lines between Timelines end at stubs that link to the other graph's SVG.
+    Graphviz runs one process per CPU unless --jobs is given.
+    """,
+)
+@click.option(
+    "--tile",
+    "tile_size",
+    type=click.IntRange(min=1),
+    help="""
+    Like --partition, but split every Timeline into graphs of at most this
+    many time boxes.
+    
+    With SVG output, LOADFILE.viewer.html shows all of them side by side and
+    loads only the ones near where you pan (drag) and zoom (Ctrl+wheel), with
+    a table of contents of their time boxes and events. Serve the folder over
+    HTTP (python -m http.server) to use it.
+    """,
+)
+@click.option(
+    "--from",
+    "start",
+    type=click.INT,
+    help="Only draw events at or after this time",
+)
+@click.option(
+    "--until",
+    "end",
+    type=click.INT,
+    help="Only draw events at or before this time",
+)
+@click.option(
+    "--character",
+    "characters",
+    type=click.STRING,
+    multiple=True,
+    help="""
+    Only draw events with this character and lines of groups that include them.
+    
+    Repeat to select several characters.
+    """,
+)
+@click.option(
+    "--place",
+    "places",
+    type=click.STRING,
+    multiple=True,
+    help="""
+    Only draw events in this Place (or every Place of this Timeline).
+    
+    Repeat to select several.  Lines that leave the selection end at stubs.
+    """,
+)
+@click.option(
+    "--lazy-universal",
+    type=click.BOOL,
+    is_flag=True,
+    help="""
+    Only create the per-place events of a universal Event in places that a
+    Character visits, instead of in every place of its Timeline.
+    
+    The rest of the places share the Event's node on the Timeline.
+    """,
+)
+@click.option(
+    "--auto-combine",
+    type=click.IntRange(min=1),
+    metavar="RUN",
+    help="""
+    Combine the lines of characters who travel together for at least RUN
+    links in a row, as if a Combiner row said so.
+    
+    The new Combiner rows and the number of lines saved are printed.
+    """,
+)
+@click.option(
+    "--stream",
+    type=click.BOOL,
+    is_flag=True,
+    help="""
+    Write the DOT files while the graphs are drawn instead of building them
+    in memory first, so memory use no longer grows with the size of the
+    graph. The files are the same either way.
+    """,
+)
+@click.option(
+    "--tooltips",
+    type=click.Choice(["inline", "sidecar"], case_sensitive=False),
+    default="inline",
+    show_default=True,
+    help="""
+    Where the text of tooltips goes. sidecar writes it once to
+    LOADFILE.tooltips.json and only an id into the graphs, which makes the
+    DOT and SVG files much smaller; open the .svg.html page next to each SVG
+    (served over HTTP) to see the tooltips on hover.
+    """,
+)
+@click.option(
+    "--snapshot/--no-snapshot",
+    default=False,
+    show_default=True,
+    help="""
+    Save the parsed story to LOADFILE.snap and load it instead of LOADFILE
+    while LOADFILE is unchanged, e.g. to re-render with other --dir or
+    --time-style settings. Remove the snapshots with 'rm *.tsv.snap'.
+    Loading runs pickle, so snapshots are signed with a key kept in your
+    config directory and any .snap you did not write is ignored.
+    """,
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    envvar="PLOTDMG_CACHE_DIR",
+    help="""
+    Keep rendered files here and copy them instead of running Graphviz
+    again when the same graph is rendered to the same format.
+    """,
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=512,
+    show_default=True,
+    help="Megabytes kept in --cache-dir before the least recently used are removed",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="""
+    Number of Graphviz processes to run at once (default 1).
+    
+    The storyline and friendship graphs are laid out independently.
+    """,
+)
+@click.option(
+    "--profile",
+    type=click.File("w"),
+    help="""
+    Write wall time, CPU time (of the phase's thread, and of the whole
+    process with Graphviz), and peak RSS of every phase, plus node, edge,
+    and cluster counts, to this JSON file ('-' for stdout).
+    """,
+)
+@click.option(
+    "--cprofile",
+    type=click.Choice(Profiler.phase_names),
+    help="Also dump cProfile stats for this phase to LOADFILE.<phase>.prof",
 )
 def main(
     loadfile,
     rankdir: str,
     output_list: List[str],
     quiet: bool,
+    emit: str,
+    stats_only: bool,
     color_names: bool,
     time_style: str,
+    layout_budget: Optional[float],
+    watch: bool,
+    partition: bool,
+    tile_size: Optional[int],
+    start: Optional[int],
+    end: Optional[int],
+    characters: Tuple[str, ...],
+    places: Tuple[str, ...],
+    lazy_universal: bool,
+    auto_combine: Optional[int],
+    stream: bool,
+    tooltips: str,
+    snapshot: bool,
+    cache_dir: Optional[str],
+    cache_size: int,
+    jobs: Optional[int],
+    profile: Optional[TextIO],
+    cprofile: Optional[str],
 ):
-    s = Storyboard(
-        file=loadfile,
-        g_attr={"rankdir": rankdir.upper().strip()},
-        color_names=color_names,
-        time_style=time_style,
-    )
-    s.output(quiet, output_list)
+    story_args = {
+        "g_attr": {"rankdir": rankdir.upper().strip()},
+        "color_names": color_names,
+        "time_style": time_style,
+        "layout_budget": layout_budget,
+        "render_cache": RenderCache(cache_dir, cache_size << 20) if cache_dir else None,
+        "render_jobs": jobs or ((os.cpu_count() or 1) if partition or tile_size else 1),
+        "partition": partition,
+        "tile_size": tile_size or 0,
+        "lazy_universal": lazy_universal,
+        "auto_combine": auto_combine or 0,
+        "stream": stream,
+        "tooltips": tooltips,
+    }
+    selection = Selection(start, end, characters, places)
+    if selection != Selection():
+        story_args["selection"] = selection
+    if watch:
+        if loadfile == "-":
+            raise click.UsageError("Cannot watch stdin for changes")
+        if partition or tile_size:
+            raise click.UsageError("Cannot --watch a --partition(ed) story")
+        if stream:
+            raise click.UsageError("Cannot --watch a --stream(ed) story")
+        if stats_only or emit.lower() != "render":
+            raise click.UsageError("--watch always renders")
+        if profile or cprofile:
+            raise click.UsageError("Profile a single render, not --watch")
+        Storyboard.watch(loadfile, quiet, output_list, **story_args)
+        return
+    if profile or cprofile:
+        story_args["profiler"] = Profiler(cprofile, loadfile.split(".tsv")[0])
+    snap: Optional[str] = f"{loadfile}.snap" if snapshot and loadfile != "-" else None
+    s = Storyboard.load_snapshot(snap, loadfile, **story_args) if snap else None
+    if not s:
+        s = Storyboard(file=loadfile, load_final=False, **story_args)
+        s.finalize()
+        if snap:
+            s.save_snapshot(snap, loadfile)
+    if stats_only:
+        click.echo(s.stats)
+    else:
+        try:
+            s.output(quiet, output_list, render=emit.lower() == "render")
+        except subprocess.TimeoutExpired as e:
+            raise click.ClickException(
+                f"{e.cmd[0]} took over {s.layout_budget:g}s to lay out {e.cmd[-1]}"
+                f" with -t {s.time_style}; "
+                + (
+                    "even the cheapest layout ran out of time, raise --layout-budget"
+                    if s.auto_layout
+                    else "try -t auto to fall back to cheaper layouts"
+                )
+            ) from e
+    if profile:
+        profile.write(s.profiler.report() + "\n")
 
 
 if __name__ == "__main__":
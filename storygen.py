@@ -0,0 +1,162 @@
+#!venv/bin/python
+# coding=UTF-8
+# -*- coding: UTF-8 -*-
+# vim: set fileencoding=UTF-8 :
+
+"""
+Writes random (but valid) story .tsv files for testing and benchmarks
+
+Every Timeline gets its own block of timestamps so that the automatically
+created time boxes never collide between Timelines.  Characters mostly stay
+on a home Timeline and move forward in time; loopers go back to an event
+they already visited, and each Combiner is a group of characters who travel
+the same path.
+"""
+
+import random
+from typing import *
+
+import click
+
+COLORS: List[str] = ["", "red", "blue", "darkgreen", "orange", "purple", "brown"]
+
+
+def generate_story(
+    path: str,
+    *,
+    timelines: int = 2,
+    places: int = 4,
+    events: int = 20,
+    characters: int = 50,
+    events_per_character: int = 10,
+    combiners: int = 5,
+    universal: int = 3,
+    loopers: int = 5,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    :param timelines: number of Timelines
+    :param places: Places per Timeline
+    :param events: Events per Place
+    :param universal: universal Events per Timeline
+    :param loopers: characters who revisit an event
+    :param combiners: groups of 2-4 characters who travel together
+    """
+    rng = random.Random(seed)
+    rows: List[List[str]] = [["TYPE", "NAME", "COLOR", "SHORTNAME"]]
+    stride: int = 20 * (events + universal) + 100
+    when: Dict[str, int] = {}  # event name as a character refers to it -> time
+    home: Dict[int, List[str]] = {}
+
+    for t in range(timelines):
+        place_names = [f"W{t}P{p}" for p in range(places)]
+        rows.append(
+            ["Timeline", f"World{t}", rng.choice(COLORS), f"W{t}", *place_names]
+        )
+        home[t] = []
+        slots = range(2 * max(events, universal))
+        for p in place_names:
+            for k in rng.sample(slots, min(events, len(slots))):
+                name = f"{p}E{k}"
+                when[name] = t * stride + 10 * k
+                rows.append(["Event", name, rng.choice(COLORS), str(when[name]), p])
+                home[t].append(name)
+        for k in rng.sample(slots, min(universal, len(slots))):
+            name = f"W{t}U{k}"
+            rows.append(["Event", name, "", str(t * stride + 10 * k + 5), f"World{t}"])
+            for p in place_names:
+                when[f"{name}-{p}"] = t * stride + 10 * k + 5
+                home[t].append(f"{name}-{p}")
+
+    every_event: List[str] = list(when)
+
+    def path_for(looper: bool) -> List[str]:
+        t = rng.randrange(timelines)
+        path = [
+            rng.choice(home[t] if rng.random() < 0.8 else every_event)
+            for _ in range(events_per_character)
+        ]
+        path.sort(key=when.get)
+        if looper and len(path) > 1:
+            path.append(rng.choice(path[:-1]))
+        return path
+
+    groups: List[List[int]] = []
+    c: int = 0
+    for _ in range(combiners):
+        size = rng.randint(2, 4)
+        if c + size > characters:
+            break
+        groups.append(list(range(c, c + size)))
+        c += size
+    paths: Dict[int, List[str]] = {}
+    for g in groups:
+        shared = path_for(False)
+        for i in g:
+            paths[i] = shared
+    looping = set(rng.sample(range(characters), min(loopers, characters)))
+    for i in range(characters):
+        if i in looping:
+            paths[i] = path_for(True)
+        elif i not in paths:
+            paths[i] = path_for(False)
+        rows.append(["Character", f"Char{i}", rng.choice(COLORS), f"C{i}", *paths[i]])
+    for n, g in enumerate(groups):
+        rows.append(["Combiner", f"Group{n}", "", f"G{n}", *(f"Char{i}" for i in g)])
+
+    with open(path, "w", newline="") as f:
+        f.writelines("\t".join(r) + "\n" for r in rows)
+
+
+@click.command()
+@click.argument("outfile", type=click.Path(dir_okay=False, writable=True))
+@click.option("--timelines", type=click.IntRange(min=1), default=2, show_default=True)
+@click.option(
+    "--places",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Places per Timeline",
+)
+@click.option(
+    "--events",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Events per Place",
+)
+@click.option("--characters", type=click.IntRange(min=0), default=50, show_default=True)
+@click.option(
+    "--events-per-character",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+)
+@click.option(
+    "--combiners",
+    type=click.IntRange(min=0),
+    default=5,
+    show_default=True,
+    help="Groups of characters who travel together",
+)
+@click.option(
+    "--universal",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="Universal Events per Timeline",
+)
+@click.option(
+    "--loopers",
+    type=click.IntRange(min=0),
+    default=5,
+    show_default=True,
+    help="Characters who revisit an Event",
+)
+@click.option("--seed", type=click.INT, help="Seed for a reproducible story")
+def main(outfile, **kwargs):
+    generate_story(outfile, **kwargs)
+
+
+if __name__ == "__main__":
+    main()